@@ -1,13 +1,14 @@
 """Data models for EV Charging Extractor."""
 
 from .charging_receipt import ChargingReceipt
+from .receipt_batch import ReceiptBatch
 
 try:
     from .provider_mapping import ProviderMapping
-    __all__ = ['ChargingReceipt', 'ProviderMapping']
+    __all__ = ['ChargingReceipt', 'ReceiptBatch', 'ProviderMapping']
 except ImportError:
     # Fallback if provider_mapping doesn't exist yet
-    __all__ = ['ChargingReceipt']
+    __all__ = ['ChargingReceipt', 'ReceiptBatch']
     
     # Create a simple fallback ProviderMapping class
     class ProviderMapping:
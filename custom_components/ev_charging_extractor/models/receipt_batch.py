@@ -0,0 +1,56 @@
+"""ReceiptBatch data model."""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from .charging_receipt import ChargingReceipt
+
+
+@dataclass
+class ReceiptBatch:
+    """Column-oriented collection of receipts parsed by one provider parser."""
+    provider: str
+    currency: str
+    indices: List[int] = field(default_factory=list)  # Position of each receipt in the input batch
+    dates: List[datetime] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    costs: List[float] = field(default_factory=list)
+    energies: List[Optional[float]] = field(default_factory=list)
+    durations: List[Optional[str]] = field(default_factory=list)
+    subjects: List[str] = field(default_factory=list)
+    raw_data: Optional[List[str]] = None  # Only kept when debugging
+    
+    def append(self, index: int, date: datetime, location: str, cost: float,
+               energy_kwh: Optional[float] = None, session_duration: Optional[str] = None,
+               email_subject: str = "", raw_data: Optional[str] = None) -> None:
+        """Add one receipt's fields to the columns."""
+        self.indices.append(index)
+        self.dates.append(date)
+        self.locations.append(location)
+        self.costs.append(cost)
+        self.energies.append(energy_kwh)
+        self.durations.append(session_duration)
+        self.subjects.append(email_subject)
+        if self.raw_data is not None:
+            self.raw_data.append(raw_data or "")
+    
+    def __len__(self) -> int:
+        """Return the number of receipts in the batch."""
+        return len(self.costs)
+    
+    def to_receipts(self) -> List[ChargingReceipt]:
+        """Materialize the batch as ChargingReceipt objects."""
+        return [
+            ChargingReceipt(
+                provider=self.provider,
+                date=self.dates[i],
+                location=self.locations[i],
+                cost=self.costs[i],
+                currency=self.currency,
+                energy_kwh=self.energies[i],
+                session_duration=self.durations[i],
+                email_subject=self.subjects[i],
+                raw_data=self.raw_data[i] if self.raw_data is not None else ""
+            )
+            for i in range(len(self))
+        ]
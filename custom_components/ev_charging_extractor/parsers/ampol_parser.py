@@ -1,91 +1,313 @@
 """Ampol specific parser."""
-import re
+import functools
 import logging
+
+# The regex module has faster literal prefilters for the "scan for a label, then
+# check" shape of these patterns; the stdlib engine handles them identically
+try:
+    import regex as re
+except ImportError:
+    import re
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 from .base_parser import BaseParser
 
 _LOGGER = logging.getLogger(__name__)
 
+# Ampol domains and email patterns
+_SENDER_INDICATORS = (
+    'ampcharge.com.au',
+    'accounts@ampcharge.com.au',
+    'ampol.com.au',
+    'noreply@ampol.com.au',
+    'support@ampcharge.com.au',
+    'info@ampcharge.com.au',
+)
+
+# Subject indicators
+_SUBJECT_INDICATORS = (
+    'tax invoice',
+    'charging receipt',
+    'ev charging',
+    'ampcharge',
+    'invoice',
+    'receipt',
+)
+
+_CONTENT_INDICATORS = ('ampcharge', 'ampol')
+
+# Anchors and values for the tabular-layout fallbacks (scanned with pos offsets)
+_ENERGY_DELIVERED_RE = re.compile(r'Energy\s+Delivered', re.IGNORECASE)
+_KWH_VALUE_RE = re.compile(r'([0-9]+\.[0-9]+)\s*kWh', re.IGNORECASE)
+_DURATION_LABEL_RE = re.compile(r'Duration', re.IGNORECASE)
+_HMS_RE = re.compile(r'(\d{2}:\d{2}:\d{2})')
+
+
+
+def _alternative_index(match) -> int:
+    """Return the index of the capture group for the alternative that matched."""
+    return next(index for index, group in enumerate(match.groups(), 1) if group is not None)
+
+
+def _alternative_value(match) -> str:
+    """Return the value captured by the alternative that matched."""
+    return match.group(_alternative_index(match))
+
+
+def _prioritized_matches(pattern, text: str, pos: int = 0) -> list:
+    """Scan text once and return the first match of each alternative, in priority order.
+
+    As when the alternatives were searched one by one, each contributes only its first
+    match; when that one fails validation the next alternative is tried.
+    """
+    first_matches = {}
+    for match in pattern.finditer(text, pos):
+        first_matches.setdefault(_alternative_index(match), match)
+    return [first_matches[index] for index in sorted(first_matches)]
+
+
+def _scan_start(found: dict, required: Optional[str], anchors: tuple) -> int:
+    """Return where a literal-prefixed pattern can first match, or -1 if it cannot match.
+
+    found is the parser's prescan() of the text. The pattern needs the required literal
+    somewhere and starts at one of the anchor literals; with no anchors the whole text
+    is scanned.
+    """
+    if required is not None and required not in found:
+        return -1
+    if not anchors:
+        return 0
+    positions = [found[anchor] for anchor in anchors if anchor in found]
+    return min(positions) if positions else -1
+
+
+def _nth_newline(text: str, start: int, count: int) -> Optional[int]:
+    """Return the position of the count-th newline at or after start, if any."""
+    position = start - 1
+    for _ in range(count):
+        position = text.find('\n', position + 1)
+        if position < 0:
+            return None
+    return position
+
+
+def _iter_slash_dates(text: str):
+    """Yield (date_str, day, month, year) for each D/M/YYYY date in text, left to right.
+    
+    Equivalent to a regex scan for 1-2 digits, '/', 1-2 digits, '/', 4 digits, but driven by str.find('/').
+    """
+    length = len(text)
+    resume_at = 0  # matches don't overlap, like re.finditer
+    slash = text.find('/')
+    while slash >= 0:
+        # One or two digits before the first slash (the match starts as early as possible)
+        start = slash
+        while start > resume_at and slash - start < 2 and text[start - 1].isdecimal():
+            start -= 1
+        
+        # One or two digits, then the second slash
+        second = slash + 1
+        while second < length and second - slash <= 2 and text[second].isdecimal():
+            second += 1
+        
+        end = second + 5
+        if (start < slash and slash + 1 < second and second < length and text[second] == '/'
+                and end <= length and text[second + 1:end].isdecimal()):
+            date_str = text[start:end]
+            yield date_str, int(text[start:slash]), int(text[slash + 1:second]), int(text[second + 1:end])
+            resume_at = end
+            slash = text.find('/', end)
+        else:
+            slash = text.find('/', slash + 1)
+
+
+def _hms_to_seconds(value: str) -> int:
+    """Convert an HH:MM:SS string into a number of seconds."""
+    return int(value[0:2]) * 3600 + int(value[3:5]) * 60 + int(value[6:8])
+
+
+# Currency symbols the cost patterns anchor on (Ampol receipts are billed in dollars)
+_CURRENCY_SYMBOLS = {'AUD': '$', 'NZD': '$', 'USD': '$'}
+
+
+@functools.lru_cache(maxsize=8)
+def _get_ampol_patterns(currency: str = "AUD") -> tuple:
+    """Compile the Ampol cost, location, energy, duration and date patterns for a currency.
+
+    Each pattern is an alternation scanned once, with alternatives listed in priority order.
+    Location and duration entries are (pattern, required literal, anchor literals) for
+    _scan_start; the others are plain compiled patterns.
+    """
+    symbol = re.escape(_CURRENCY_SYMBOLS.get(currency, '$'))
+    
+    def compile_pattern(pattern: str):
+        return re.compile(pattern.replace(r'\$', symbol), re.IGNORECASE)
+    
+    cost_res = tuple(compile_pattern(pattern) for pattern in [
+        # Primary Ampol patterns from the example (bold markdown)
+        r'\*\*\$([0-9]+\.[0-9]{2})\*\*\s+for\s+EV\s+charging'  # **$30.72** for EV charging
+        r'|\*\*Total\s+Cost\*\*[^\d]*\*\*\$([0-9]+\.[0-9]{2})\*\*'  # **Total Cost** **$30.72**
+        r'|Total\s+Cost[:\s]*\*\*\$([0-9]+\.[0-9]{2})\*\*',  # Total Cost **$30.72**
+        
+        # Keyword formats
+        r'Total\s+includes[^\$]*\$([0-9]+\.[0-9]{2})'  # Total includes 10% GST of $2.79 (for total extraction)
+        r'|Total[:\s]*\$([0-9]+\.[0-9]{2})'  # Total: $30.72
+        r'|Amount[:\s]*\$([0-9]+\.[0-9]{2})'  # Amount: $30.72
+        r'|Cost[:\s]*\$([0-9]+\.[0-9]{2})'  # Cost: $30.72
+        r'|Charged[:\s]*\$([0-9]+\.[0-9]{2})',  # Charged: $30.72
+        
+        # Tax invoice and GST patterns (might capture total)
+        r'Tax\s+Invoice[^\$]*\$([0-9]+\.[0-9]{2})'  # Tax Invoice ... $30.72
+        r'|Invoice\s+Total[:\s]*\$([0-9]+\.[0-9]{2})'  # Invoice Total: $30.72
+        r'|includes\s+10%\s+GST[^\$]*\$([0-9]+\.[0-9]{2})',  # includes 10% GST of $2.79
+        
+        # General dollar patterns
+        r'\$([0-9]+\.[0-9]{2})\s+for\s+EV'  # $30.72 for EV
+        r'|EV\s+charging[:\s]*\$([0-9]+\.[0-9]{2})',  # EV charging: $30.72
+    ])
+    
+    loc_res = (
+        # Primary location patterns from the example, scanned from the first "Ampol"
+        (compile_pattern(
+            r'Ampol\s+Foodary\s+([A-Za-z\s]+)\s*-\s*[a-z0-9\-]+'  # Ampol Foodary Marsden Park - t184-hu1-3522-025-1
+            r'|(Ampol\s+Foodary\s+[A-Za-z\s]+)'  # Ampol Foodary Marsden Park
+        ), 'foodary', ('ampol',)),
+        
+        # Address patterns
+        (compile_pattern(
+            r'([A-Za-z\s]+Road\s+\d+,\s+[A-Za-z\s]+\s+\d{4})'  # Richmond Road 875, Marsden Park 2765
+            r'|(\d+\s+[A-Za-z\s]+Road,\s+[A-Za-z\s]+\s+\d{4})'  # 875 Richmond Road, Marsden Park 2765
+        ), None, ()),
+        
+        # Station/Site patterns
+        (compile_pattern(
+            r'Station[:\s]*([^\n\r]+)'  # Station: ...
+            r'|Location[:\s]*([^\n\r]+)'  # Location: ...
+            r'|Site[:\s]*([^\n\r]+)'  # Site: ...
+        ), None, ()),
+        
+        # Charger ID with location
+        (compile_pattern(
+            r'Charger\s+ID[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*([A-Za-z\s]+-[a-z0-9\-]+)'  # After charger details
+        ), None, ()),
+        
+        # General address patterns
+        (compile_pattern(
+            r'(\d+\s+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Drive|Dr)[^\n\r,]*,\s*[A-Za-z\s]+\s*\d{4})'
+            r'|([A-Za-z\s]+,\s*[A-Z]{2,3}\s*\d{4})'  # Suburb, STATE 1234
+        ), None, ()),
+    )
+    
+    energy_res = tuple(compile_pattern(pattern) for pattern in [
+        # Primary energy patterns from the example - VERY SPECIFIC
+        r'Energy\s+Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh'  # Energy Delivered 40.967 kWh
+        r'|Total\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh'  # Total Energy: 40.967 kWh
+        r'|kWh\s+Delivered[:\s]*([0-9]+\.[0-9]+)'  # kWh Delivered: 40.967
+        r'|Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Delivered: 40.967 kWh
+        
+        # Handle Ampol's specific layout where "Energy Delivered" appears on one line
+        # and the value appears several lines later
+        r'Energy\s+Delivered[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*([0-9]+\.[0-9]+)\s*kWh',
+        
+        # Alternative formats
+        r'Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh'  # Energy: 40.967 kWh (also Session Energy)
+        r'|Charged[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Charged: 40.967 kWh
+    ])
+    
+    # Every duration pattern opens with a label, so scanning starts at its first occurrence
+    dur_res = (
+        # Primary duration patterns from the example - VERY SPECIFIC
+        # (a "Start Time ... End Time ... Duration 00:21:05" section is covered by the first one)
+        (compile_pattern(
+            r'Duration[:\s]*(\d{2}:\d{2}:\d{2})'  # Duration 00:21:05 (also Charge/Session/Charging Duration)
+            r'|Time[:\s]*(\d{2}:\d{2}:\d{2})'  # Time 00:21:05 (also Total Time)
+        ), None, ('duration', 'time')),
+        
+        # Handle Ampol's specific layout where "Duration" appears on one line
+        # and the value appears several lines later
+        (compile_pattern(
+            r'Duration[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*(\d{2}:\d{2}:\d{2})'
+        ), None, ('duration',)),
+        
+        # Minutes format - be careful not to conflict with energy
+        (compile_pattern(
+            r'Duration[:\s]*(\d+)\s*minutes?\s*(?!kWh)'  # Duration: 21 minutes (but not if followed by kWh)
+            r'|Charging\s+Time[:\s]*(\d+)\s*minutes?\s*(?!kWh)'  # Charging Time: 21 minutes
+        ), None, ('duration', 'charging')),
+    )
+    
+    # Primary date patterns from the example (Australian format DD/MM/YYYY)
+    date_res = (
+        compile_pattern(
+            r'Start\s+Time[:\s]*(\d{1,2}/\d{1,2}/\d{4})\s+\d{1,2}:\d{2}:\d{2}\s*[AP]M'  # Start Time 18/07/2025 09:13 PM
+            r'|End\s+Time[:\s]*(\d{1,2}/\d{1,2}/\d{4})\s+\d{1,2}:\d{2}:\d{2}\s*[AP]M'  # End Time 18/07/2025 09:34 PM
+        ),
+    )
+    
+    return cost_res, loc_res, energy_res, dur_res, date_res
+
 
 class AmpolParser(BaseParser):
     """Parser for Ampol charging receipts."""
     
+    # Ampol receipts carry the total/energy/duration in the first couple of KB
+    head_scan_chars = 4096
+    
+    # Literals the location/duration pattern entries and the energy/duration checks use
+    anchor_literals = ('ampol', 'foodary', 'duration', 'time', 'charging', 'kwh', 'min')
+    
+    def __init__(self, default_currency: str = "AUD", verbose_logging: bool = False):
+        """Initialize Ampol parser."""
+        super().__init__(default_currency, verbose_logging)
+        # Compiled once per currency and shared between instances
+        (self._cost_res, self._loc_res, self._energy_res,
+         self._dur_res, self._date_res) = _get_ampol_patterns(default_currency)
+        self._currency_symbol = _CURRENCY_SYMBOLS.get(default_currency, '$')
+    
     def get_provider_name(self) -> str:
         """Return the provider name."""
         return "Ampol"
     
-    def can_parse(self, sender: str, subject: str) -> bool:
+    @classmethod
+    def sender_domains(cls) -> Tuple[str, ...]:
+        """Return the sender domains used to dispatch emails to this parser."""
+        return ('ampcharge.com.au', 'ampol.com.au')
+    
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
         """Check if this parser can handle the email."""
-        sender_lower = sender.lower()
-        subject_lower = subject.lower()
-        
-        # Check for Ampol domains and email patterns
-        ampol_indicators = [
-            'ampcharge.com.au',
-            'accounts@ampcharge.com.au',
-            'ampol.com.au',
-            'noreply@ampol.com.au',
-            'support@ampcharge.com.au',
-            'info@ampcharge.com.au'
-        ]
+        sender_lower = sender if lowered else sender.lower()
+        subject_lower = subject if lowered else subject.lower()
         
-        # Check for subject indicators
-        subject_indicators = [
-            'tax invoice',
-            'charging receipt',
-            'ev charging',
-            'ampcharge',
-            'invoice',
-            'receipt'
-        ]
-        
-        has_ampol_sender = any(indicator in sender_lower for indicator in ampol_indicators)
-        has_relevant_subject = any(indicator in subject_lower for indicator in subject_indicators)
+        has_ampol_sender = any(indicator in sender_lower for indicator in _SENDER_INDICATORS)
+        has_relevant_subject = any(indicator in subject_lower for indicator in _SUBJECT_INDICATORS)
         
         # Also check content for Ampol indicators
-        has_ampol_content = any(indicator in sender_lower for indicator in ['ampcharge', 'ampol'])
+        has_ampol_content = any(indicator in sender_lower for indicator in _CONTENT_INDICATORS)
         
         return has_ampol_sender or (has_ampol_content and has_relevant_subject)
     
     def extract_cost(self, text: str) -> Optional[float]:
         """Extract cost using Ampol specific patterns."""
-        # Ampol specific cost patterns based on the example
-        ampol_patterns = [
-            # Primary Ampol patterns from the example
-            r'\*\*\$([0-9]+\.[0-9]{2})\*\*\s+for\s+EV\s+charging',  # **$30.72** for EV charging
-            r'\*\*Total\s+Cost\*\*[^\d]*\*\*\$([0-9]+\.[0-9]{2})\*\*',  # **Total Cost** **$30.72**
-            r'Total\s+Cost[:\s]*\*\*\$([0-9]+\.[0-9]{2})\*\*',  # Total Cost **$30.72**
-            r'Total\s+includes[^\$]*\$([0-9]+\.[0-9]{2})',  # Total includes 10% GST of $2.79 (for total extraction)
-            
-            # Alternative formats
-            r'Total[:\s]*\$([0-9]+\.[0-9]{2})',  # Total: $30.72
-            r'Amount[:\s]*\$([0-9]+\.[0-9]{2})',  # Amount: $30.72
-            r'Cost[:\s]*\$([0-9]+\.[0-9]{2})',  # Cost: $30.72
-            r'Charged[:\s]*\$([0-9]+\.[0-9]{2})',  # Charged: $30.72
-            
-            # Tax invoice patterns
-            r'Tax\s+Invoice[^\$]*\$([0-9]+\.[0-9]{2})',  # Tax Invoice ... $30.72
-            r'Invoice\s+Total[:\s]*\$([0-9]+\.[0-9]{2})',  # Invoice Total: $30.72
-            
-            # GST patterns (might capture total)
-            r'includes\s+10%\s+GST[^\$]*\$([0-9]+\.[0-9]{2})',  # includes 10% GST of $2.79
-            
-            # General dollar patterns
-            r'\$([0-9]+\.[0-9]{2})\s+for\s+EV',  # $30.72 for EV
-            r'EV\s+charging[:\s]*\$([0-9]+\.[0-9]{2})',  # EV charging: $30.72
-        ]
+        # Every Ampol cost pattern needs the currency symbol - without it only the
+        # general patterns (e.g. "12.34 AUD") can match
+        if self._currency_symbol not in text:
+            return super().extract_cost(text)
         
-        for pattern in ampol_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
+        # Each entry is an alternation scanned once; alternatives are tried in priority order
+        for pattern in self._cost_res:
+            for match in _prioritized_matches(pattern, text):
                 try:
-                    cost_value = float(match.group(1))
+                    cost_value = float(_alternative_value(match))
                     # Skip GST amounts (usually small values like $2.79)
                     if cost_value > 5.0:  # Reasonable minimum for total cost
                         if self.verbose_logging:
-                            _LOGGER.debug("Found Ampol cost using pattern '%s': $%.2f", pattern, cost_value)
+                            _LOGGER.debug("Found Ampol cost using pattern '%s': $%.2f", pattern.pattern, cost_value)
                         return cost_value
                 except (ValueError, IndexError):
                     continue
@@ -95,33 +317,13 @@ class AmpolParser(BaseParser):
     
     def extract_location(self, text: str) -> Optional[str]:
         """Extract location using Ampol specific patterns."""
-        # Ampol specific location patterns
-        ampol_patterns = [
-            # Primary location patterns from the example
-            r'Ampol\s+Foodary\s+([A-Za-z\s]+)\s*-\s*[a-z0-9\-]+',  # Ampol Foodary Marsden Park - t184-hu1-3522-025-1
-            r'(Ampol\s+Foodary\s+[A-Za-z\s]+)',  # Ampol Foodary Marsden Park
-            
-            # Address patterns
-            r'([A-Za-z\s]+Road\s+\d+,\s+[A-Za-z\s]+\s+\d{4})',  # Richmond Road 875, Marsden Park 2765
-            r'(\d+\s+[A-Za-z\s]+Road,\s+[A-Za-z\s]+\s+\d{4})',  # 875 Richmond Road, Marsden Park 2765
-            
-            # Station/Site patterns
-            r'Station[:\s]*([^\n\r]+)',  # Station: ...
-            r'Location[:\s]*([^\n\r]+)',  # Location: ...
-            r'Site[:\s]*([^\n\r]+)',  # Site: ...
-            
-            # Charger ID with location
-            r'Charger\s+ID[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*\n[^\n]*([A-Za-z\s]+-[a-z0-9\-]+)',  # After charger details
-            
-            # General address patterns
-            r'(\d+\s+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Drive|Dr)[^\n\r,]*,\s*[A-Za-z\s]+\s*\d{4})',
-            r'([A-Za-z\s]+,\s*[A-Z]{2,3}\s*\d{4})',  # Suburb, STATE 1234
-        ]
-        
-        for pattern in ampol_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                location = match.group(1).strip()
+        found = self.prescan(text)
+        for pattern, required, anchors in self._loc_res:
+            start = _scan_start(found, required, anchors)
+            if start < 0:
+                continue
+            for match in _prioritized_matches(pattern, text, start):
+                location = _alternative_value(match).strip()
                 
                 # Clean up the location
                 location = location.replace('\n', ' ').replace('\r', ' ')
@@ -138,29 +340,14 @@ class AmpolParser(BaseParser):
     
     def extract_energy(self, text: str) -> Optional[float]:
         """Extract energy using Ampol specific patterns."""
-        # Ampol specific energy patterns - handle the specific layout
-        ampol_patterns = [
-            # Primary energy patterns from the example - VERY SPECIFIC
-            r'Energy\s+Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Energy Delivered 40.967 kWh
-            r'Total\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Total Energy: 40.967 kWh
-            r'kWh\s+Delivered[:\s]*([0-9]+\.[0-9]+)',  # kWh Delivered: 40.967
-            r'Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Delivered: 40.967 kWh
-            
-            # Handle Ampol's specific layout where "Energy Delivered" appears on one line
-            # and the value appears several lines later
-            r'Energy\s+Delivered[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*([0-9]+\.[0-9]+)\s*kWh',
-            
-            # Alternative formats
-            r'Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Energy: 40.967 kWh
-            r'Session\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Session Energy: 40.967 kWh
-            r'Charged[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Charged: 40.967 kWh
-        ]
+        # All Ampol energy patterns (and the tabular fallback) end in a kWh value
+        if 'kwh' not in self.prescan(text):
+            return super().extract_energy(text)
         
-        for pattern in ampol_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
+        for pattern in self._energy_res:
+            for match in _prioritized_matches(pattern, text):
                 try:
-                    energy_value = float(match.group(1))
+                    energy_value = float(_alternative_value(match))
                     # Validate reasonable energy range and exclude duration-like values
                     if 0.1 < energy_value < 200:  # Reasonable range for energy
                         # Additional check: if the value is very small (like a duration in hours)
@@ -176,29 +363,29 @@ class AmpolParser(BaseParser):
                                 continue
                         
                         if self.verbose_logging:
-                            _LOGGER.debug("Found Ampol energy: %.2f kWh using pattern: %s", energy_value, pattern)
+                            _LOGGER.debug("Found Ampol energy: %.2f kWh using pattern: %s", energy_value, pattern.pattern)
                         return energy_value
                 except (ValueError, IndexError):
                     continue
         
         # Try a more systematic approach for Ampol's tabular layout
         # Look for the pattern: "Energy Delivered" followed by lines until we find a kWh value
-        energy_delivered_match = re.search(r'Energy\s+Delivered', text, re.IGNORECASE)
+        energy_delivered_match = _ENERGY_DELIVERED_RE.search(text)
         if energy_delivered_match:
-            # Get text after "Energy Delivered"
-            remaining_text = text[energy_delivered_match.end():]
+            # Scan the text after "Energy Delivered" in place rather than slicing a copy
+            anchor_end = energy_delivered_match.end()
+            
+            # Energy value should be several lines after label - find where the second
+            # line after it starts once instead of counting newlines per candidate
+            value_start = _nth_newline(text, anchor_end, 2)
             
             # Look for the first kWh value that's not a time duration
-            kwh_matches = re.finditer(r'([0-9]+\.[0-9]+)\s*kWh', remaining_text, re.IGNORECASE)
-            for kwh_match in kwh_matches:
+            for kwh_match in _KWH_VALUE_RE.finditer(text, anchor_end):
                 try:
                     energy_value = float(kwh_match.group(1))
                     if 0.1 < energy_value < 200:  # Reasonable energy range
                         # Check if this value appears after duration info
-                        text_before_match = remaining_text[:kwh_match.start()]
-                        # Count newlines - if there are several, this is likely the energy value
-                        newline_count = text_before_match.count('\n')
-                        if newline_count >= 2:  # Energy value should be several lines after label
+                        if value_start is not None and kwh_match.start() > value_start:
                             if self.verbose_logging:
                                 _LOGGER.debug("Found Ampol energy via systematic search: %.2f kWh", energy_value)
                             return energy_value
@@ -210,125 +397,144 @@ class AmpolParser(BaseParser):
     
     def extract_duration(self, text: str) -> Optional[str]:
         """Extract duration using Ampol specific patterns."""
-        # Ampol specific duration patterns
-        ampol_patterns = [
-            # Primary duration patterns from the example - VERY SPECIFIC
-            r'Duration[:\s]*(\d{2}:\d{2}:\d{2})',  # Duration 00:21:05
-            r'Charge\s+Duration[:\s]*(\d{2}:\d{2}:\d{2})',  # Charge Duration: 00:21:05
-            r'Session\s+Duration[:\s]*(\d{2}:\d{2}:\d{2})',  # Session Duration: 00:21:05
-            r'Charging\s+Duration[:\s]*(\d{2}:\d{2}:\d{2})',  # Charging Duration: 00:21:05
-            r'Total\s+Time[:\s]*(\d{2}:\d{2}:\d{2})',  # Total Time: 00:21:05
-            r'Time[:\s]*(\d{2}:\d{2}:\d{2})',  # Time 00:21:05
-            
-            # Handle Ampol's specific layout where "Duration" appears on one line
-            # and the value appears several lines later
-            r'Duration[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*\n[^\n\r]*(\d{2}:\d{2}:\d{2})',
-            
-            # Time range patterns
-            r'Start\s+Time[:\s]*[^\n]*End\s+Time[:\s]*[^\n]*Duration[:\s]*(\d{2}:\d{2}:\d{2})',  # From start/end time section
-            
-            # Minutes format - be careful not to conflict with energy
-            r'Duration[:\s]*(\d+)\s*minutes?\s*(?!kWh)',  # Duration: 21 minutes (but not if followed by kWh)
-            r'Charging\s+Time[:\s]*(\d+)\s*minutes?\s*(?!kWh)',  # Charging Time: 21 minutes
-            r'(\d+)\s*mins?\s*(\d+)?\s*secs?\s*(?!kWh)',  # 21 mins 5 secs (but not if followed by kWh)
-        ]
+        found = self.prescan(text)
+        # Ampol durations are either HH:MM:SS or a number of minutes
+        if ':' not in text and 'min' not in found:
+            return super().extract_duration(text)
         
-        for pattern in ampol_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                if len(match.groups()) > 1 and match.group(2):
-                    # Handle patterns with minutes and seconds
-                    minutes = match.group(1)
-                    seconds = match.group(2)
-                    duration = f"{minutes}m {seconds}s"
-                else:
-                    duration = match.group(1).strip()
-                
+        for pattern, required, anchors in self._dur_res:
+            start = _scan_start(found, required, anchors)
+            if start < 0:
+                continue
+            for match in _prioritized_matches(pattern, text, start):
+                duration = _alternative_value(match).strip()
                 if self.verbose_logging:
-                    _LOGGER.debug("Found Ampol duration: %s using pattern: %s", duration, pattern)
+                    _LOGGER.debug("Found Ampol duration: %s using pattern: %s", duration, pattern.pattern)
                 return duration
         
+        # 21 mins 5 secs (but not if followed by kWh)
+        match = re.search(r'(\d+)\s*mins?\s*(\d+)?\s*secs?\s*(?!kWh)', text, re.IGNORECASE)
+        if match:
+            if match.group(2):
+                duration = f"{match.group(1)}m {match.group(2)}s"
+            else:
+                duration = match.group(1).strip()
+            
+            if self.verbose_logging:
+                _LOGGER.debug("Found Ampol duration: %s using minutes/seconds pattern", duration)
+            return duration
+        
         # Try a more systematic approach for Ampol's tabular layout
         # Look for the pattern: "Duration" followed by lines until we find a time value
-        duration_match = re.search(r'Duration', text, re.IGNORECASE)
+        duration_match = _DURATION_LABEL_RE.search(text)
         if duration_match:
-            # Get text after "Duration"
-            remaining_text = text[duration_match.end():]
+            # Session start/end timestamps (e.g. 18/07/2025 09:13 PM) - the clock part of
+            # these must not be mistaken for the duration value
+            timestamps = []
+            for ts_match in re.finditer(r'\d{1,2}/\d{1,2}/\d{4}\s+(\d{1,2}:\d{2}(?::\d{2})?\s*[AP]M)', text, re.IGNORECASE):
+                clock = ts_match.group(1).upper().replace(' ', '')
+                fmt = '%I:%M:%S%p' if clock.count(':') == 2 else '%I:%M%p'
+                try:
+                    timestamps.append(datetime.strptime(clock, fmt))
+                except ValueError:
+                    continue
+                if len(timestamps) == 2:
+                    break
+            
+            # Seconds that belong to a timestamp rather than a duration (both the
+            # 12-hour clock as written and its 24-hour equivalent)
+            clock_seconds = set()
+            for parsed in timestamps:
+                day_seconds = parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+                clock_seconds.add(day_seconds)
+                clock_seconds.add(day_seconds % 43200 or 43200)
+            
+            expected_seconds = None
+            if len(timestamps) == 2:
+                expected_seconds = int((timestamps[1] - timestamps[0]).total_seconds()) % 86400
             
             # Look for the first time format (HH:MM:SS) that's not a timestamp
-            time_matches = re.finditer(r'(\d{2}:\d{2}:\d{2})', remaining_text)
-            for time_match in time_matches:
-                duration_value = time_match.group(1)
-                # Check if this appears to be a duration (not a timestamp)
-                text_before_match = remaining_text[:time_match.start()]
-                
-                # Skip if it's clearly a timestamp (has date or "AM/PM" nearby)
-                if not re.search(r'\d{1,2}/\d{1,2}/\d{4}|[AP]M', text_before_match + remaining_text[time_match.start():time_match.end()+20], re.IGNORECASE):
-                    # Count newlines - if there are several, this is likely the duration value
-                    newline_count = text_before_match.count('\n')
-                    if newline_count >= 2:  # Duration value should be several lines after label
-                        if self.verbose_logging:
-                            _LOGGER.debug("Found Ampol duration via systematic search: %s", duration_value)
-                        return duration_value
+            candidates = [
+                (time_match.group(1), _hms_to_seconds(time_match.group(1)))
+                for time_match in _HMS_RE.finditer(text, duration_match.end())
+            ]
+            
+            duration_value = None
+            for value, seconds in candidates:
+                # Matches end - start (to within a minute when the timestamps only
+                # carry HH:MM)
+                if expected_seconds is not None and abs(seconds - expected_seconds) < 60:
+                    duration_value = value
+                    break
+            
+            if duration_value is None:
+                for value, seconds in candidates:
+                    if seconds < 86400 and seconds not in clock_seconds:
+                        duration_value = value
+                        break
+            
+            if duration_value:
+                if self.verbose_logging:
+                    _LOGGER.debug("Found Ampol duration via systematic search: %s", duration_value)
+                return duration_value
         
         # Fallback to general patterns
         return super().extract_duration(text)
     
     def extract_date(self, text: str):
         """Extract date using Ampol specific patterns."""
-        # Ampol specific date patterns
-        ampol_date_patterns = [
-            # Primary date patterns from the example (Australian format DD/MM/YYYY)
-            r'Start\s+Time[:\s]*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}:\d{2}\s*[AP]M)',  # Start Time 18/07/2025 09:13 PM
-            r'End\s+Time[:\s]*(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}:\d{2}\s*[AP]M)',  # End Time 18/07/2025 09:34 PM
-            r'(\d{1,2}/\d{1,2}/\d{4})',  # 18/07/2025 (standalone)
-            
-            # Alternative formats
-            r'Date[:\s]*(\d{1,2}/\d{1,2}/\d{4})',  # Date: 18/07/2025
-            r'Session\s+Date[:\s]*(\d{1,2}/\d{1,2}/\d{4})',  # Session Date: 18/07/2025
-            r'Invoice\s+Date[:\s]*(\d{1,2}/\d{1,2}/\d{4})',  # Invoice Date: 18/07/2025
+        # Try Ampol specific patterns first
+        for pattern in self._date_res:
+            for match in _prioritized_matches(pattern, text):
+                session_date = self._parse_date_str(_alternative_value(match).strip())
+                if session_date:
+                    return session_date
+        
+        # Any other DD/MM/YYYY - also covers Date:, Session Date:, Invoice Date: and dates
+        # with a time. Scanned without a regex and built straight from the digits.
+        for date_str, day, month, year in _iter_slash_dates(text):
+            try:
+                session_date = datetime(year, month, day)
+            except ValueError:
+                session_date = self._parse_date_str(date_str)
             
-            # With time
-            r'(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2})',  # 18/07/2025 09:13
-        ]
+            if session_date:
+                if self.verbose_logging:
+                    _LOGGER.debug("Found Ampol date: %s -> %s", date_str, session_date)
+                return session_date
         
-        # Try Ampol specific patterns first
-        for pattern in ampol_date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    date_str = match.group(1).strip()
-                    
-                    # Import pandas here to avoid circular imports
+        # Fallback to base parser
+        return super().extract_date(text)
+    
+    def _parse_date_str(self, date_str: str) -> Optional[datetime]:
+        """Parse an Ampol date string, trying other layouts if it isn't DD/MM/YYYY."""
+        try:
+            # Ampol uses Australian format DD/MM/YYYY - strptime handles it directly
+            try:
+                session_date = datetime.strptime(date_str, '%d/%m/%Y')
+                if self.verbose_logging:
+                    _LOGGER.debug("Found Ampol date: %s -> %s", date_str, session_date)
+                return session_date
+            except ValueError:
+                pass
+            
+            if pd:
+                # Only reach for pandas on unusual date strings
+                session_date = pd.to_datetime(date_str, dayfirst=True)
+                if self.verbose_logging:
+                    _LOGGER.debug("Found Ampol date: %s -> %s", date_str, session_date)
+                return session_date.to_pydatetime()
+            else:
+                # Try other formats
+                for fmt in ['%d/%m/%y', '%m/%d/%Y', '%Y/%m/%d']:
                     try:
-                        import pandas as pd
-                    except ImportError:
-                        pd = None
-                    
-                    if pd:
-                        # Ampol uses Australian format DD/MM/YYYY - use dayfirst=True
-                        session_date = pd.to_datetime(date_str, dayfirst=True)
-                        if self.verbose_logging:
-                            _LOGGER.debug("Found Ampol date: %s -> %s", date_str, session_date)
-                        return session_date.to_pydatetime()
-                    else:
-                        # Fallback without pandas - try to parse DD/MM/YYYY
-                        try:
-                            session_date = datetime.strptime(date_str, '%d/%m/%Y')
-                            return session_date
-                        except:
-                            # Try other formats
-                            for fmt in ['%d/%m/%y', '%m/%d/%Y', '%Y/%m/%d']:
-                                try:
-                                    session_date = datetime.strptime(date_str, fmt)
-                                    return session_date
-                                except:
-                                    continue
-                
-                except Exception as e:
-                    if self.verbose_logging:
-                        _LOGGER.debug("Date parsing failed for '%s': %s", date_str, e)
-                    continue
+                        session_date = datetime.strptime(date_str, fmt)
+                        return session_date
+                    except:
+                        continue
         
-        # Fallback to base parser
-        return super().extract_date(text)
\ No newline at end of file
+        except Exception as e:
+            if self.verbose_logging:
+                _LOGGER.debug("Date parsing failed for '%s': %s", date_str, e)
+        
+        return None
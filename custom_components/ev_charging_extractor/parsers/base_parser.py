@@ -1,22 +1,78 @@
 """Base parser class for EV charging providers with fixed imports."""
 import logging
+import re
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     import pandas as pd
 except ImportError:
     pd = None
 
-from ..models import ChargingReceipt
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+from ..models import ChargingReceipt, ReceiptBatch
+
+try:
+    from ..utils import PatternUtils, DateUtils
+except ImportError:
+    PatternUtils = DateUtils = None
 
 _LOGGER = logging.getLogger(__name__)
 
+# hyperscan scratch space can only be used by one scan at a time, so each thread keeps its own
+_hyperscan_local = threading.local()
+
+# Fallback patterns used when the shared utils are unavailable
+_FALLBACK_COST_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Total[:\s]*\$([0-9]+\.[0-9]{2})',
+    r'Amount[:\s]*\$([0-9]+\.[0-9]{2})',
+    r'\$([0-9]+\.[0-9]{2})',
+))
+
+_FALLBACK_ENERGY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'([0-9]+\.[0-9]+)\s*kWh',
+    r'(\d+\.\d+)\s*kWh',
+))
+
+_FALLBACK_LOCATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Location[:\s]*([^\n\r]+)',
+    r'Station[:\s]*([^\n\r]+)',
+    r'Site[:\s]*([^\n\r]+)',
+))
+
+_FALLBACK_DURATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Duration[:\s]*(\d+:\d+(?::\d+)?)',
+    r'(\d+)\s*minutes?',
+    r'(\d+)m(?:\s*(\d+)s)?',
+))
+
+_FALLBACK_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d{4}-\d{1,2}-\d{1,2})',
+    r'(\d{1,2}/\d{1,2}/\d{4})',
+    r'([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})',
+))
+
 
 class BaseParser(ABC):
     """Abstract base class for provider-specific parsers."""
     
+    # When set, fields are first extracted from this many leading characters and the
+    # full text is only scanned on a miss. Providers that put key data late leave it unset.
+    head_scan_chars: Optional[int] = None
+    
+    # Lowercase literals the provider's patterns are keyed on, located by prescan()
+    anchor_literals: Tuple[str, ...] = ()
+    
+    # (text, anchors) for the last two texts scanned - the head slice and the full text.
+    # Threads parsing concurrently may evict each other's entries, which only costs a rescan.
+    _prescan_cache: tuple = ()
+    
     def __init__(self, default_currency: str = "AUD", verbose_logging: bool = False):
         """Initialize base parser."""
         self.default_currency = default_currency
@@ -29,163 +85,237 @@ class BaseParser(ABC):
         pass
     
     @abstractmethod
-    def can_parse(self, sender: str, subject: str) -> bool:
-        """Check if this parser can handle the email."""
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
+        """Check if this parser can handle the email (lowered: sender/subject are already lowercase)."""
         pass
     
+    @classmethod
+    def sender_domains(cls) -> Tuple[str, ...]:
+        """Return the lowercase sender domains this provider's emails come from (for dispatch)."""
+        return ()
+    
+    def prescan(self, text: str) -> Dict[str, int]:
+        """Return the first position of each anchor literal that occurs in text (case-insensitive).
+        
+        The extract_* methods of one email share the result. Positions are 0 when
+        lowercasing changed the text length, as they would no longer line up. ASCII text
+        is scanned with hyperscan when it is installed.
+        """
+        for cached_text, anchors in self._prescan_cache:
+            if cached_text is text:
+                return anchors
+        
+        if hyperscan is not None and self.anchor_literals and text.isascii():
+            anchors = self._hyperscan_prescan(text)
+            self._prescan_cache = self._prescan_cache[-1:] + ((text, anchors),)
+            return anchors
+        
+        text_lower = text.lower()
+        positions_valid = len(text_lower) == len(text)
+        anchors = {}
+        for literal in self.anchor_literals:
+            position = text_lower.find(literal)
+            if position >= 0:
+                anchors[literal] = position if positions_valid else 0
+        
+        self._prescan_cache = self._prescan_cache[-1:] + ((text, anchors),)
+        return anchors
+    
+    def _hyperscan_prescan(self, text: str) -> Dict[str, int]:
+        """Locate all anchor literals in a single pass over ASCII text with hyperscan."""
+        literals = self.anchor_literals
+        database = type(self).__dict__.get('_anchor_database')
+        if database is None:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(literal).encode() for literal in literals],
+                ids=list(range(len(literals))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(literals),
+            )
+            type(self)._anchor_database = database
+        
+        anchors = {}
+        
+        def on_match(literal_id, start, end, flags, context):
+            # Matches arrive in order of end offset, so the first one per literal is the earliest
+            anchors.setdefault(literals[literal_id], start)
+        
+        scratches = getattr(_hyperscan_local, 'scratches', None)
+        if scratches is None:
+            scratches = _hyperscan_local.scratches = {}
+        scratch = scratches.get(database)
+        if scratch is None:
+            scratch = scratches[database] = hyperscan.Scratch(database)
+        
+        database.scan(text.encode('ascii'), match_event_handler=on_match, scratch=scratch)
+        return anchors
+    
     def parse_receipt(self, email_data: Dict[str, any]) -> Optional[ChargingReceipt]:
         """Parse email data into a charging receipt."""
+        fields = self._extract_receipt_fields(email_data)
+        if fields is None:
+            return None
+        
+        session_date, location, cost, energy_kwh, session_duration = fields
+        
+        # Create receipt
+        receipt = ChargingReceipt(
+            provider=self.provider_name,
+            date=session_date,
+            location=location or "Unknown",
+            cost=cost,
+            currency=self.default_currency,
+            energy_kwh=energy_kwh,
+            session_duration=session_duration,
+            email_subject=email_data.get('subject', ''),
+            raw_data=email_data['text_content'][:2000]  # Store first 2000 chars for debugging
+        )
+        
+        return receipt
+    
+    def parse_batch(self, emails: List[Dict[str, any]]) -> ReceiptBatch:
+        """Parse a batch of emails into column-oriented storage.
+        
+        ``indices`` records which input email each receipt came from. Raw text is
+        only kept when verbose logging is enabled.
+        """
+        batch = ReceiptBatch(
+            provider=self.provider_name,
+            currency=self.default_currency,
+            raw_data=[] if self.verbose_logging else None
+        )
+        
+        for index, email_data in enumerate(emails):
+            fields = self._extract_receipt_fields(email_data)
+            if fields is None:
+                continue
+            
+            session_date, location, cost, energy_kwh, session_duration = fields
+            batch.append(
+                index, session_date, location or "Unknown", cost, energy_kwh, session_duration,
+                email_data.get('subject', ''),
+                email_data['text_content'][:2000] if self.verbose_logging else None
+            )
+        
+        return batch
+    
+    def _extract_receipt_fields(self, email_data: Dict[str, any]) -> Optional[tuple]:
+        """Extract (date, location, cost, energy, duration) from email data, or None."""
         try:
             text = email_data['text_content']
-            subject = email_data['subject']
-            sender = email_data['sender']
             
             if not text.strip():
                 if self.verbose_logging:
                     _LOGGER.debug("Skipping email - no text content found")
                 return None
             
+            # Most receipts carry the key fields near the top; footers can be long
+            head = None
+            if self.head_scan_chars and len(text) > self.head_scan_chars:
+                head = text[:self.head_scan_chars]
+            
             # Extract data using provider-specific methods
-            cost = self.extract_cost(text)
+            cost = self._extract_field(self.extract_cost, text, head)
             if not cost or cost <= 0:
                 if self.verbose_logging:
                     _LOGGER.debug("No valid cost found for %s email", self.provider_name)
                 return None
             
             # Extract other fields
+            # Dates always fall back to the current time, so a miss in the head can't be
+            # detected - scan the full text
             session_date = self.extract_date(text)
-            location = self.extract_location(text)
-            energy_kwh = self.extract_energy(text)
-            session_duration = self.extract_duration(text)
+            location = self._extract_field(self.extract_location, text, head)
+            energy_kwh = self._extract_field(self.extract_energy, text, head)
+            session_duration = self._extract_field(self.extract_duration, text, head)
             
             if self.verbose_logging:
                 _LOGGER.debug("Extracted data - Provider: %s, Cost: %.2f, Location: %s, Energy: %s kWh", 
                             self.provider_name, cost, location, energy_kwh)
             
-            # Create receipt
-            receipt = ChargingReceipt(
-                provider=self.provider_name,
-                date=session_date,
-                location=location or "Unknown",
-                cost=cost,
-                currency=self.default_currency,
-                energy_kwh=energy_kwh,
-                session_duration=session_duration,
-                email_subject=subject,
-                raw_data=text[:2000]  # Store first 2000 chars for debugging
-            )
-            
-            return receipt
+            return session_date, location, cost, energy_kwh, session_duration
             
         except Exception as e:
             _LOGGER.error("Error parsing %s receipt: %s", self.provider_name, e)
             return None
     
+    @staticmethod
+    def _extract_field(extractor, text: str, head: Optional[str]):
+        """Run an extractor on the head of the text first, then on the full text."""
+        if head is not None:
+            result = extractor(head)
+            if result:
+                return result
+        return extractor(text)
+    
     def extract_cost(self, text: str) -> Optional[float]:
         """Extract cost from text. Can be overridden by subclasses."""
-        try:
-            from ..utils import PatternUtils
+        if PatternUtils is not None:
             return PatternUtils.extract_cost(text)
-        except ImportError:
-            # Fallback cost extraction
-            import re
-            patterns = [
-                r'Total[:\s]*\$([0-9]+\.[0-9]{2})',
-                r'Amount[:\s]*\$([0-9]+\.[0-9]{2})',
-                r'\$([0-9]+\.[0-9]{2})',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    try:
-                        return float(match.group(1))
-                    except:
-                        continue
-            return None
+        
+        # Fallback cost extraction
+        for pattern in _FALLBACK_COST_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                try:
+                    return float(match.group(1))
+                except:
+                    continue
+        return None
     
     def extract_energy(self, text: str) -> Optional[float]:
         """Extract energy from text. Can be overridden by subclasses."""
-        try:
-            from ..utils import PatternUtils
+        if PatternUtils is not None:
             return PatternUtils.extract_energy(text)
-        except ImportError:
-            # Fallback energy extraction
-            import re
-            patterns = [
-                r'([0-9]+\.[0-9]+)\s*kWh',
-                r'(\d+\.\d+)\s*kWh',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    try:
-                        energy = float(match.group(1))
-                        if 0 < energy < 200:
-                            return energy
-                    except:
-                        continue
-            return None
+        
+        # Fallback energy extraction
+        for pattern in _FALLBACK_ENERGY_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                try:
+                    energy = float(match.group(1))
+                    if 0 < energy < 200:
+                        return energy
+                except:
+                    continue
+        return None
     
     def extract_location(self, text: str) -> Optional[str]:
         """Extract location from text. Can be overridden by subclasses."""
-        try:
-            from ..utils import PatternUtils
+        if PatternUtils is not None:
             return PatternUtils.extract_location(text)
-        except ImportError:
-            # Fallback location extraction
-            import re
-            patterns = [
-                r'Location[:\s]*([^\n\r]+)',
-                r'Station[:\s]*([^\n\r]+)',
-                r'Site[:\s]*([^\n\r]+)',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    location = match.group(1).strip()[:200]
-                    if len(location) > 5:
-                        return location
-            return None
+        
+        # Fallback location extraction
+        for pattern in _FALLBACK_LOCATION_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                location = match.group(1).strip()[:200]
+                if len(location) > 5:
+                    return location
+        return None
     
     def extract_duration(self, text: str) -> Optional[str]:
         """Extract duration from text. Can be overridden by subclasses."""
-        try:
-            from ..utils import PatternUtils
+        if PatternUtils is not None:
             return PatternUtils.extract_duration(text)
-        except ImportError:
-            # Fallback duration extraction
-            import re
-            patterns = [
-                r'Duration[:\s]*(\d+:\d+(?::\d+)?)',
-                r'(\d+)\s*minutes?',
-                r'(\d+)m(?:\s*(\d+)s)?',
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    return match.group(1).strip()
-            return None
+        
+        # Fallback duration extraction
+        for pattern in _FALLBACK_DURATION_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1).strip()
+        return None
     
     def extract_date(self, text: str) -> datetime:
         """Extract date from text with fallback to current time."""
-        try:
-            from ..utils import DateUtils
+        if DateUtils is not None:
             result = DateUtils.extract_date_from_text(text)
             if result:
                 return result
-        except ImportError:
-            pass
         
         # Fallback date extraction
-        import re
-        patterns = [
-            r'(\d{4}-\d{1,2}-\d{1,2})',
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-            r'([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _FALLBACK_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 try:
                     date_str = match.group(1)
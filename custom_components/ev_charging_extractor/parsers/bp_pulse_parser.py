@@ -1,12 +1,19 @@
 """BP Pulse specific parser."""
 import re
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 from .base_parser import BaseParser
 
 _LOGGER = logging.getLogger(__name__)
 
+_SENDER_DOMAINS = (
+    'bppulse.com.au',
+    'bp',  # Be careful with this one as it's generic
+)
+
+_SUBJECT_KEYWORDS = ('charging', 'receipt', 'session', 'invoice')
+
 
 class BPPulseParser(BaseParser):
     """Parser for BP Pulse charging receipts."""
@@ -15,15 +22,17 @@ class BPPulseParser(BaseParser):
         """Return the provider name."""
         return "BP Pulse"
     
-    def can_parse(self, sender: str, subject: str) -> bool:
+    @classmethod
+    def sender_domains(cls) -> Tuple[str, ...]:
+        """Return the sender domains used to dispatch emails to this parser."""
+        return ('bppulse.com.au',)
+    
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
         """Check if this parser can handle the email."""
-        sender_lower = sender.lower()
-        return any(domain in sender_lower for domain in [
-            'bppulse.com.au',
-            'bp' # Be careful with this one as it's generic
-        ]) and any(keyword in subject.lower() for keyword in [
-            'charging', 'receipt', 'session', 'invoice'
-        ])
+        sender_lower = sender if lowered else sender.lower()
+        subject_lower = subject if lowered else subject.lower()
+        return (any(domain in sender_lower for domain in _SENDER_DOMAINS)
+                and any(keyword in subject_lower for keyword in _SUBJECT_KEYWORDS))
     
     def extract_cost(self, text: str) -> Optional[float]:
         """Extract cost using BP Pulse specific patterns."""
@@ -2,12 +2,32 @@
 import re
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from .base_parser import BaseParser
 
 _LOGGER = logging.getLogger(__name__)
 
+# Chargefox domains and email patterns
+_SENDER_INDICATORS = (
+    'chargefox.com',
+    'noreply@chargefox.com',
+    'info@chargefox.com',
+    'receipts@chargefox.com',
+    'support@chargefox.com',
+)
+
+# Subject indicators
+_SUBJECT_INDICATORS = (
+    'charging receipt',
+    'payment receipt',
+    'charging session',
+    'ev charging',
+    'charge complete',
+    'invoice',
+    'receipt',
+)
+
 
 class ChargefoxParser(BaseParser):
     """Parser for Chargefox charging receipts."""
@@ -16,33 +36,18 @@ class ChargefoxParser(BaseParser):
         """Return the provider name."""
         return "Chargefox"
     
-    def can_parse(self, sender: str, subject: str) -> bool:
+    @classmethod
+    def sender_domains(cls) -> Tuple[str, ...]:
+        """Return the sender domains used to dispatch emails to this parser."""
+        return ('chargefox.com',)
+    
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
         """Check if this parser can handle the email."""
-        sender_lower = sender.lower()
-        subject_lower = subject.lower()
-        
-        # Check for Chargefox domains and email patterns
-        chargefox_indicators = [
-            'chargefox.com',
-            'noreply@chargefox.com',
-            'info@chargefox.com',
-            'receipts@chargefox.com',
-            'support@chargefox.com'
-        ]
-        
-        # Check for subject indicators
-        subject_indicators = [
-            'charging receipt',
-            'payment receipt', 
-            'charging session',
-            'ev charging',
-            'charge complete',
-            'invoice',
-            'receipt'
-        ]
+        sender_lower = sender if lowered else sender.lower()
+        subject_lower = subject if lowered else subject.lower()
         
-        has_chargefox_sender = any(indicator in sender_lower for indicator in chargefox_indicators)
-        has_relevant_subject = any(indicator in subject_lower for indicator in subject_indicators)
+        has_chargefox_sender = any(indicator in sender_lower for indicator in _SENDER_INDICATORS)
+        has_relevant_subject = any(indicator in subject_lower for indicator in _SUBJECT_INDICATORS)
         
         return has_chargefox_sender and has_relevant_subject
     
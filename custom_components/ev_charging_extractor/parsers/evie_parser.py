@@ -2,107 +2,444 @@
 import re
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 try:
-    import pandas as pd
+    import re2
 except ImportError:
-    pd = None
+    re2 = None
 
 from .base_parser import BaseParser
 
 _LOGGER = logging.getLogger(__name__)
 
+# EVIE domains and email patterns
+_SENDER_INDICATORS = (
+    'goevie.com.au',
+    'evie.com.au',
+    'noreply@evie.com.au',
+    'no-reply@goevie.com.au',
+    'receipts@goevie.com.au',
+    'info@goevie.com.au',
+    'support@goevie.com.au',
+)
+
+# Subject indicators
+_SUBJECT_INDICATORS = (
+    'evie networks receipt',
+    'your evie networks receipt',
+    'receipt',
+    'invoice',
+    'charging session',
+    'tax invoice',
+    'payment confirmation',
+)
+
+
+
+def _compile(pattern: str):
+    """Compile an EVIE pattern with only the flags that can change what it matches.
+    
+    IGNORECASE is kept when a letter appears outside an escape (\\s, \\d, ...), DOTALL when
+    a '.' appears outside escapes and character classes.
+    """
+    needs_ignorecase = needs_dotall = False
+    escaped = in_class = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+            needs_ignorecase = needs_ignorecase or char.isalpha()
+        elif char == '[':
+            in_class = True
+        else:
+            needs_dotall = needs_dotall or char == '.'
+            needs_ignorecase = needs_ignorecase or char.isalpha()
+    return re.compile(pattern, (re.IGNORECASE if needs_ignorecase else 0) | (re.DOTALL if needs_dotall else 0))
+
+
+class _SequencePattern:
+    """Two patterns searched one after the other, standing in for `first.*?second` (DOTALL).
+    
+    `.*?` retries the rest of the pattern from every character up to the end of the text,
+    once per candidate first match. The second search here simply starts where the first
+    match ended. A miss from there is a miss for every later candidate, so the result is
+    the same.
+    """
+    
+    def __init__(self, first: str, second: str):
+        self.first = _compile(first)
+        self.second = _compile(second)
+        self.pattern = f'{first}.*?{second}'
+    
+    def search(self, text: str, pos: int = 0):
+        first_match = self.first.search(text, pos)
+        if first_match is None:
+            return None
+        second_match = self.second.search(text, first_match.end())
+        if second_match is None:
+            return None
+        return _SequenceMatch(first_match.groups() + second_match.groups())
+
+
+class _SequenceMatch:
+    """Result of a _SequencePattern search: the groups of both matches, in order."""
+    
+    def __init__(self, groups: tuple):
+        self._groups = groups
+    
+    def groups(self) -> tuple:
+        return self._groups
+    
+    def group(self, index: int):
+        return self._groups[index - 1]
+
+
+# Each pattern is paired with the lowercase literals it needs (any one of them); a
+# pattern is only searched when prescan() found one of its literals in the text.
+
+# Enhanced EVIE specific cost patterns for HTML content
+_COST_PATTERNS = tuple((literals, _compile(p)) for literals, p in [
+    # Primary EVIE patterns from HTML
+    (('amount',), r'Total\s+Amount[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Total Amount: $19.54
+    (('due',), r'Amount\s+Due[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Amount Due: $19.54
+    (('final',), r'Final\s+Amount[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Final Amount: $19.54
+    (('total',), r'Total[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Total: $19.54
+    
+    # HTML table patterns
+    (('<td',), r'<td[^>]*>\s*Total\s*</td>\s*<td[^>]*>\s*\$?([0-9]+\.[0-9]{2})'),  # HTML table cells
+    (('<td',), r'<td[^>]*>\s*Amount\s*</td>\s*<td[^>]*>\s*\$?([0-9]+\.[0-9]{2})'),
+    
+    # Bold/emphasis patterns from HTML
+    (('<b', '<strong'), r'<(?:b|strong)[^>]*>\s*\$?([0-9]+\.[0-9]{2})\s*</(?:b|strong)>.*(?:AUD|Total|Amount)'),
+    (('<b', '<strong'), r'(?:Total|Amount)[^0-9]*<(?:b|strong)[^>]*>\s*\$?([0-9]+\.[0-9]{2})'),
+    
+    # Currency patterns
+    (('aud',), r'\$([0-9]+\.[0-9]{2})\s+AUD'),  # $19.54 AUD
+    (('aud',), r'([0-9]+\.[0-9]{2})\s*AUD'),  # 19.54 AUD
+    (('aud',), r'AUD\s*\$?([0-9]+\.[0-9]{2})'),  # AUD $19.54
+    
+    # Payment confirmation patterns
+    (('payment',), r'Payment\s+of\s+\$?([0-9]+\.[0-9]{2})'),  # Payment of $19.54
+    (('charged',), r'Charged\s+\$?([0-9]+\.[0-9]{2})'),  # Charged $19.54
+    (('paid',), r'You\s+paid\s+\$?([0-9]+\.[0-9]{2})'),  # You paid $19.54
+    
+    # Invoice patterns
+    (('invoice',), r'Invoice\s+Total[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Invoice Total: $19.54
+    (('invoice',), r'Tax\s+Invoice[^0-9]*\$?([0-9]+\.[0-9]{2})'),  # Tax Invoice ... $19.54
+    
+    # Session cost patterns
+    (('cost',), r'Session\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Session Cost: $19.54
+    (('cost',), r'Charging\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Charging Cost: $19.54
+    (('cost',), r'Energy\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})'),  # Energy Cost: $19.54
+    
+    # Generic dollar patterns (use as last resort)
+    (('$',), r'\$([0-9]+\.[0-9]{2})(?!\s*(?:kWh|/kWh|per))'),  # $19.54 (but not per kWh)
+])
+
+# Enhanced EVIE specific location patterns
+# A leftmost match of a pattern opening with a run of [A-Za-z\s] (or [0-9-]) always
+# starts where that run starts, so the lookbehinds only skip start positions inside a
+# run - retrying each of those is what made long runs quadratic to search.
+_LOCATION_PATTERNS = tuple((literals, _compile(p)) for literals, p in [
+    # Service center patterns
+    (('centre',), r'(?<![A-Za-z\s])([A-Za-z\s]+Service\s+Centre)[^<\n]*([0-9-]+\s+[A-Za-z\s]+(?:Drive|Road|Street|Ave|Avenue|Highway|Hwy)[^<\n,]*,\s*[A-Z]{2,3}\s*[0-9]{4})'),
+    (('location',), r'Location[:\s]*([^<\n]+Service\s+Centre[^<\n]*[0-9]+[^<\n]*,\s*[A-Z]{2,3}\s*[0-9]{4})'),
+    
+    # Station ID with location
+    (('station',), r'Station\s+ID[:\s]*[A-Z0-9]+[^<\n]*Location[:\s]*([^<\n]+)'),
+    (('station',), r'Station[:\s]*([^<\n]+)'),  # Station: location
+    
+    # HTML table location patterns
+    (('<td',), r'<td[^>]*>\s*(?:Location|Site|Station)\s*</td>\s*<td[^>]*>\s*([^<]+)'),
+    (('<td',), r'<td[^>]*>\s*([^<]+Service\s+Centre[^<]*)</td>'),
+    
+    # Address patterns from HTML
+    (('-',), r'(?<![A-Za-z\s])([A-Za-z\s]+-[A-Za-z\s]+)[^<\n]*([0-9-]+\s+[A-Za-z\s]+(?:Highway|Hwy|Street|St|Road|Rd|Avenue|Ave|Drive|Dr)[^<\n,]*,\s*[A-Z]{2,3}\s*[0-9]{4})'),
+    
+    # General location patterns
+    (('location',), r'Location[:\s]*([^<\n\r]+)'),  # Location: ...
+    (('site',), r'Site[:\s]*([^<\n\r]+)'),  # Site: ...
+    (('address',), r'Address[:\s]*([^<\n\r]+)'),  # Address: ...
+    (('charging',), r'Charging\s+(?:at|station)[:\s]*([^<\n\r]+)'),  # Charging at: ...
+    
+    # Full address patterns
+    ((',',), r'(?<![0-9-])([0-9-]+\s+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Highway|Hwy|Lane|Ln)[^<\n,]*,\s*[A-Za-z\s]+,\s*[A-Z]{2,3}\s*[0-9]{4})'),
+    ((',',), r'(?<![A-Za-z\s])([A-Za-z\s]+,\s*[A-Z]{2,3}\s*[0-9]{4})'),  # Suburb, STATE 1234
+    
+    # Service center without full address
+    (('centre',), r'(?<![A-Za-z\s])([A-Za-z\s]+Service\s+Centre)'),  # Just the service center name
+])
+
+# Enhanced EVIE specific energy patterns
+_ENERGY_PATTERNS = tuple((literals, _compile(p)) for literals, p in [
+    # Primary EVIE energy patterns
+    (('energy',), r'Total\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh'),  # Total Energy: 26.4047 kWh
+    (('energy',), r'Energy\s+Consumed[:\s]*([0-9]+\.[0-9]+)\s*kWh'),  # Energy Consumed: 26.4047 kWh
+    (('energy',), r'Energy\s+Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh'),  # Energy Delivered: 26.4047 kWh
+    (('delivered',), r'kWh\s+Delivered[:\s]*([0-9]+\.[0-9]+)'),  # kWh Delivered: 26.4047
+    (('energy',), r'Session\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh'),  # Session Energy: 26.4047 kWh
+    
+    # HTML table patterns
+    (('<td',), r'<td[^>]*>\s*(?:Energy|kWh)\s*</td>\s*<td[^>]*>\s*([0-9]+\.[0-9]+)'),
+    (('kwh',), r'<td[^>]*>\s*([0-9]+\.[0-9]+)\s*kWh\s*</td>'),
+    
+    # General energy patterns with context
+    (('kwh',), r'([0-9]+\.[0-9]+)\s*kWh\s*(?:delivered|consumed|charged)'),  # X.X kWh delivered
+    (('kwh',), r'(?:Charged|Delivered)[:\s]*([0-9]+\.[0-9]+)\s*kWh'),  # Charged: X.X kWh
+    
+    # Energy with pricing context (to distinguish from rates)
+    (('kwh',), r'([0-9]+\.[0-9]+)\s*kWh\s*@\s*\$[0-9]+\.[0-9]+'),  # X.X kWh @ $0.XX
+    (('kwh',), r'([0-9]+\.[0-9]+)\s*kWh\s*(?:for|total)'),  # X.X kWh for/total
+    
+    # Standard patterns (be more specific for EVIE)
+    (('kwh',), r'([0-9]+\.[0-9]{3,4})\s*kWh'),  # Match longer decimal precision typical of EVIE
+    (('kwh',), r'(\d+\.\d+)\s*kWh(?!\s*(?:rate|per|@|\$))'),  # kWh not followed by rate indicators
+])
+
+# Enhanced EVIE specific duration patterns
+_DURATION_PATTERNS = tuple((literals, p if isinstance(p, _SequencePattern) else _compile(p)) for literals, p in [
+    # Primary EVIE duration patterns
+    (('charging',), r'Charging\s+Time[:\s]*(\d+)m(?:in(?:ute)?s?)?'),  # Charging Time: 13m
+    (('duration',), r'Session\s+Duration[:\s]*(\d+:\d+(?::\d+)?)'),  # Session Duration: 00:13:45
+    (('duration',), r'Duration[:\s]*(\d+\s+minutes?)'),  # Duration: 13 minutes
+    (('time',), r'Total\s+Time[:\s]*(\d+:\d+(?::\d+)?)'),  # Total Time: 00:13:45
+    
+    # HTML table patterns
+    (('<td',), r'<td[^>]*>\s*(?:Duration|Time)\s*</td>\s*<td[^>]*>\s*(\d+:\d+(?::\d+)?)'),
+    (('<td',), r'<td[^>]*>\s*(\d+\s*(?:minutes?|mins?|hours?))\s*</td>'),
+    
+    # Time format patterns
+    ((':',), r'(\d{2}:\d{2}:\d{2})'),  # HH:MM:SS
+    ((':',), r'(\d{1,2}:\d{2})'),  # H:MM or HH:MM
+    
+    # Minutes format
+    (('m',), r'(\d+)\s*(?:minutes?|mins?|m)(?!\s*(?:ago|before|after))'),  # X minutes (not relative time)
+    (('session',), r'Session\s+(?:time|length)[:\s]*(\d+)\s*(?:minutes?|mins?)'),  # Session time: X minutes
+    
+    # Hours and minutes combined
+    (('h',), r'(\d+)\s*(?:hours?|hrs?|h)\s*(?:and\s*)?(\d+)?\s*(?:minutes?|mins?|m)?'),  # X hours Y minutes
+    (('h',), r'(\d+)h\s*(\d+)?m'),  # Xh Ym format
+    
+    # Session timing
+    (('started',), _SequencePattern(r'Started[^<\n]*?(\d{1,2}:\d{2})', r'(?:Ended|Finished)[^<\n]*?(\d{1,2}:\d{2})')),  # Start and end times
+])
+
+# Enhanced EVIE specific date patterns
+_DATE_PATTERNS = tuple((literals, _compile(p)) for literals, p in [
+    # EVIE typical patterns from HTML emails
+    (('at',), r'([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\s+at\s+(\d{1,2}:\d{2}:\d{2}\s*[AP]M\s*[A-Z]{3,4})'),  # July 4, 2025 at 7:54:13 PM AEST
+    (('date',), r'Session\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Session Date: July 4, 2025
+    (('date',), r'Charging\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Charging Date: July 4, 2025
+    
+    # HTML table date patterns
+    (('<td',), r'<td[^>]*>\s*(?:Date|Session Date)\s*</td>\s*<td[^>]*>\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),
+    (('<td',), r'<td[^>]*>\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\s*</td>'),
+    
+    # Alternative date formats
+    (('at',), r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})\s+at\s+(\d{1,2}:\d{2})'),  # DD/MM/YYYY at HH:MM
+    (('-',), r'(\d{4}-\d{1,2}-\d{1,2})\s+(\d{1,2}:\d{2})'),  # YYYY-MM-DD HH:MM
+    
+    # Receipt/Invoice date patterns
+    (('date',), r'Receipt\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Receipt Date: July 4, 2025
+    (('date',), r'Invoice\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Invoice Date: July 4, 2025
+    (('invoice',), r'Tax\s+Invoice[^<\n]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Tax Invoice ... July 4, 2025
+    
+    # Date in email headers or timestamps
+    (('date',), r'Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # Date: July 4, 2025
+    
+    # Standalone date patterns
+    ((',',), r'([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})'),  # July 4, 2025
+    (('/', '-'), r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})'),  # DD/MM/YYYY or MM/DD/YYYY
+    (('-',), r'(\d{4}-\d{1,2}-\d{1,2})'),  # YYYY-MM-DD
+])
+
+# Every cost/energy/duration pattern as one alternation. A single pass finds the earliest
+# position any of them can match (or that none can), so the per-pattern searches below
+# start there - priority order and first-match semantics are unchanged. A sequence pattern
+# contributes its first part, which can only start earlier than the whole.
+_COST_UNION, _ENERGY_UNION, _DURATION_UNION = (
+    re.compile('|'.join(f'(?:{getattr(pattern, "first", pattern).pattern})' for _, pattern in patterns),
+               re.IGNORECASE | re.DOTALL)
+    for patterns in (_COST_PATTERNS, _ENERGY_PATTERNS, _DURATION_PATTERNS)
+)
+
+
+def _compile_re2_bank(patterns):
+    """Return {pattern: re2 equivalent} for the given re patterns that re2 can compile.
+    
+    Patterns using lookaround (which re2 does not support) are left out and keep running on re,
+    as are sequence patterns, whose semantics come from searching their two parts in turn.
+    """
+    if re2 is None:
+        return {}
+    options = re2.Options()
+    options.case_sensitive = False
+    options.dot_nl = True
+    options.log_errors = False
+    bank = {}
+    for pattern in patterns:
+        if isinstance(pattern, _SequencePattern):
+            continue
+        try:
+            bank[pattern] = re2.compile(pattern.pattern, options)
+        except re2.error:
+            continue
+    return bank
+
+
+# DFA-backed copies of the patterns above, used by _search() when google-re2 is installed
+_RE2_PATTERNS = _compile_re2_bank([
+    pattern
+    for patterns in (_COST_PATTERNS, _LOCATION_PATTERNS, _ENERGY_PATTERNS, _DURATION_PATTERNS, _DATE_PATTERNS)
+    for _, pattern in patterns
+] + [_COST_UNION, _ENERGY_UNION, _DURATION_UNION])
+
+# Below this length the per-call overhead of re2 outweighs its faster matching
+_RE2_MIN_CHARS = 256
+
+# ASCII characters re treats as \s but re2 does not (vertical tab, file/group/record/unit separators)
+_RE2_UNSAFE_RE = re.compile('[\x0b\x1c-\x1f]')
+
+
+def _re2_eligible(text: str) -> bool:
+    """Check if text can be searched with re2, giving the same results as re.
+    
+    re2 only folds case for ASCII letters and leaves vertical tabs and the file/group/record/unit
+    separators out of its whitespace class, so it is only used for ASCII text without them -
+    both engines then agree.
+    """
+    return (bool(_RE2_PATTERNS) and len(text) >= _RE2_MIN_CHARS
+            and text.isascii() and not _RE2_UNSAFE_RE.search(text))
+
+
+def _search(pattern, text: str, pos: int = 0, use_re2: bool = False):
+    """pattern.search(text, pos), on re2 when use_re2 (see _re2_eligible) and the pattern has an re2 copy."""
+    fast_pattern = _RE2_PATTERNS.get(pattern) if use_re2 else None
+    if fast_pattern is not None:
+        return fast_pattern.search(text, pos)
+    return pattern.search(text, pos)
+
+
+# Cleanup applied to extracted values
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# HTML tags are dropped and each run of whitespace (with any tags inside it) becomes one
+# space - the same result as stripping tags first and then normalizing whitespace
+_LOC_CLEAN_RE = re.compile(r'(?:<[^>]+>)*(\s)(?:\s|<[^>]+>)*|<[^>]+>')
+
+
+def _clean_location_match(match) -> str:
+    """Replacement for _LOC_CLEAN_RE: a space for whitespace runs, nothing for bare tags."""
+    return ' ' if match.group(1) else ''
+
+
+# Month names as strptime's %B / %b read them (lowercase)
+_MONTH_NUMBERS = {
+    name: number
+    for number, names in enumerate((
+        ('january', 'jan'), ('february', 'feb'), ('march', 'mar'), ('april', 'apr'),
+        ('may', 'may'), ('june', 'jun'), ('july', 'jul'), ('august', 'aug'),
+        ('september', 'sep'), ('october', 'oct'), ('november', 'nov'), ('december', 'dec'),
+    ), start=1)
+    for name in names
+}
+
+
+def _parse_month_name_date(date_str: str) -> datetime:
+    """Parse 'July 4, 2025' or 'Jul 4, 2025' directly; raises ValueError like strptime."""
+    month_name, day_year = date_str.split(None, 1)
+    day, year = day_year.split(',')
+    month = _MONTH_NUMBERS.get(month_name.lower())
+    if month is None:
+        raise ValueError(f"unknown month name {month_name!r}")
+    return datetime(int(year), month, int(day))
+
+
+def _date_format(date_str: str) -> Optional[str]:
+    """Return the strptime format for a matched EVIE date string, chosen from its shape."""
+    if date_str[:1].isalpha():
+        # July 4, 2025 or Jul 4, 2025
+        return '%b %d, %Y' if len(date_str.split(None, 1)[0]) <= 3 else '%B %d, %Y'
+    if '-' in date_str:
+        return '%Y-%m-%d'  # 2025-07-04
+    if '/' in date_str:
+        # Australian DD/MM/YYYY, unless the middle field can only be a day (US MM/DD/YYYY)
+        fields = date_str.split('/')
+        if len(fields) == 3 and fields[1].isdigit() and int(fields[1]) > 12:
+            return '%m/%d/%Y'
+        return '%d/%m/%Y'
+    return None
+
 
 class EVIEParser(BaseParser):
     """Enhanced parser for EVIE Networks charging receipts."""
     
+    # Every literal the pattern tables are keyed on
+    anchor_literals = tuple(sorted({
+        literal
+        for patterns in (_COST_PATTERNS, _LOCATION_PATTERNS, _ENERGY_PATTERNS, _DURATION_PATTERNS, _DATE_PATTERNS)
+        for literals, _ in patterns
+        for literal in literals
+    }))
+    
+    # (text, _re2_eligible(text)) for the last two texts searched, cached like prescan()'s result
+    _re2_cache: tuple = ()
+    
     def get_provider_name(self) -> str:
         """Return the provider name."""
         return "EVIE Networks"
     
-    def can_parse(self, sender: str, subject: str) -> bool:
-        """Check if this parser can handle the email."""
-        sender_lower = sender.lower()
-        subject_lower = subject.lower()
-        
-        # Check for EVIE domains and email patterns
-        evie_indicators = [
-            'goevie.com.au',
-            'evie.com.au', 
-            'noreply@evie.com.au',
-            'no-reply@goevie.com.au',
-            'receipts@goevie.com.au',
-            'info@goevie.com.au',
-            'support@goevie.com.au'
-        ]
+    @classmethod
+    def sender_domains(cls) -> Tuple[str, ...]:
+        """Return the sender domains used to dispatch emails to this parser."""
+        return ('goevie.com.au', 'evie.com.au')
+    
+    def _use_re2(self, text: str) -> bool:
+        """Return _re2_eligible(text), decided once per text for all extract_* methods."""
+        for cached_text, eligible in self._re2_cache:
+            if cached_text is text:
+                return eligible
         
-        # Check for subject indicators
-        subject_indicators = [
-            'evie networks receipt',
-            'your evie networks receipt',
-            'receipt',
-            'invoice', 
-            'charging session',
-            'tax invoice',
-            'payment confirmation'
-        ]
+        eligible = _re2_eligible(text)
+        self._re2_cache = self._re2_cache[-1:] + ((text, eligible),)
+        return eligible
+    
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
+        """Check if this parser can handle the email."""
+        sender_lower = sender if lowered else sender.lower()
+        subject_lower = subject if lowered else subject.lower()
         
-        has_evie_sender = any(indicator in sender_lower for indicator in evie_indicators)
-        has_relevant_subject = any(indicator in subject_lower for indicator in subject_indicators)
+        has_evie_sender = any(indicator in sender_lower for indicator in _SENDER_INDICATORS)
+        has_relevant_subject = any(indicator in subject_lower for indicator in _SUBJECT_INDICATORS)
         
         return has_evie_sender and has_relevant_subject
     
     def extract_cost(self, text: str) -> Optional[float]:
         """Extract cost using EVIE specific patterns optimized for HTML content."""
-        # Enhanced EVIE specific cost patterns for HTML content
-        evie_patterns = [
-            # Primary EVIE patterns from HTML
-            r'Total\s+Amount[:\s]*\$?([0-9]+\.[0-9]{2})',  # Total Amount: $19.54
-            r'Amount\s+Due[:\s]*\$?([0-9]+\.[0-9]{2})',  # Amount Due: $19.54
-            r'Final\s+Amount[:\s]*\$?([0-9]+\.[0-9]{2})',  # Final Amount: $19.54
-            r'Total[:\s]*\$?([0-9]+\.[0-9]{2})',  # Total: $19.54
-            
-            # HTML table patterns
-            r'<td[^>]*>\s*Total\s*</td>\s*<td[^>]*>\s*\$?([0-9]+\.[0-9]{2})',  # HTML table cells
-            r'<td[^>]*>\s*Amount\s*</td>\s*<td[^>]*>\s*\$?([0-9]+\.[0-9]{2})',
-            
-            # Bold/emphasis patterns from HTML
-            r'<(?:b|strong)[^>]*>\s*\$?([0-9]+\.[0-9]{2})\s*</(?:b|strong)>.*(?:AUD|Total|Amount)',
-            r'(?:Total|Amount)[^0-9]*<(?:b|strong)[^>]*>\s*\$?([0-9]+\.[0-9]{2})',
-            
-            # Currency patterns
-            r'\$([0-9]+\.[0-9]{2})\s+AUD',  # $19.54 AUD
-            r'([0-9]+\.[0-9]{2})\s*AUD',  # 19.54 AUD
-            r'AUD\s*\$?([0-9]+\.[0-9]{2})',  # AUD $19.54
-            
-            # Payment confirmation patterns
-            r'Payment\s+of\s+\$?([0-9]+\.[0-9]{2})',  # Payment of $19.54
-            r'Charged\s+\$?([0-9]+\.[0-9]{2})',  # Charged $19.54
-            r'You\s+paid\s+\$?([0-9]+\.[0-9]{2})',  # You paid $19.54
-            
-            # Invoice patterns
-            r'Invoice\s+Total[:\s]*\$?([0-9]+\.[0-9]{2})',  # Invoice Total: $19.54
-            r'Tax\s+Invoice[^0-9]*\$?([0-9]+\.[0-9]{2})',  # Tax Invoice ... $19.54
-            
-            # Session cost patterns
-            r'Session\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})',  # Session Cost: $19.54
-            r'Charging\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})',  # Charging Cost: $19.54
-            r'Energy\s+Cost[:\s]*\$?([0-9]+\.[0-9]{2})',  # Energy Cost: $19.54
-            
-            # Generic dollar patterns (use as last resort)
-            r'\$([0-9]+\.[0-9]{2})(?!\s*(?:kWh|/kWh|per))',  # $19.54 (but not per kWh)
-        ]
+        use_re2 = self._use_re2(text)
+        union_match = _search(_COST_UNION, text, use_re2=use_re2)
+        if union_match is None:
+            return super().extract_cost(text)
+        start = union_match.start()
         
-        for pattern in evie_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        anchors = self.prescan(text)
+        for literals, pattern in _COST_PATTERNS:
+            if not any(literal in anchors for literal in literals):
+                continue
+            match = _search(pattern, text, start, use_re2=use_re2)
             if match:
+                cost_str = match.group(1)
+                if cost_str.startswith('0.'):
+                    continue  # Under $1 - a rate or small fee, rejected without converting
                 try:
-                    cost_value = float(match.group(1))
+                    cost_value = float(cost_str)
                     # Validate cost is reasonable (not a rate or small fee)
                     if 1.0 <= cost_value <= 500.0:  # Reasonable range for charging session
                         if self.verbose_logging:
-                            _LOGGER.debug("Found EVIE cost using pattern '%s': $%.2f", pattern, cost_value)
+                            _LOGGER.debug("Found EVIE cost using pattern '%s': $%.2f", pattern.pattern, cost_value)
                         return cost_value
                 except (ValueError, IndexError):
                     continue
@@ -112,39 +449,12 @@ class EVIEParser(BaseParser):
     
     def extract_location(self, text: str) -> Optional[str]:
         """Extract location using EVIE specific patterns optimized for HTML content."""
-        # Enhanced EVIE specific location patterns
-        evie_patterns = [
-            # Service center patterns
-            r'([A-Za-z\s]+Service\s+Centre)[^<\n]*([0-9-]+\s+[A-Za-z\s]+(?:Drive|Road|Street|Ave|Avenue|Highway|Hwy)[^<\n,]*,\s*[A-Z]{2,3}\s*[0-9]{4})',
-            r'Location[:\s]*([^<\n]+Service\s+Centre[^<\n]*[0-9]+[^<\n]*,\s*[A-Z]{2,3}\s*[0-9]{4})',
-            
-            # Station ID with location
-            r'Station\s+ID[:\s]*[A-Z0-9]+[^<\n]*Location[:\s]*([^<\n]+)',
-            r'Station[:\s]*([^<\n]+)',  # Station: location
-            
-            # HTML table location patterns
-            r'<td[^>]*>\s*(?:Location|Site|Station)\s*</td>\s*<td[^>]*>\s*([^<]+)',
-            r'<td[^>]*>\s*([^<]+Service\s+Centre[^<]*)</td>',
-            
-            # Address patterns from HTML
-            r'([A-Za-z\s]+-[A-Za-z\s]+)[^<\n]*([0-9-]+\s+[A-Za-z\s]+(?:Highway|Hwy|Street|St|Road|Rd|Avenue|Ave|Drive|Dr)[^<\n,]*,\s*[A-Z]{2,3}\s*[0-9]{4})',
-            
-            # General location patterns
-            r'Location[:\s]*([^<\n\r]+)',  # Location: ...
-            r'Site[:\s]*([^<\n\r]+)',  # Site: ...
-            r'Address[:\s]*([^<\n\r]+)',  # Address: ...
-            r'Charging\s+(?:at|station)[:\s]*([^<\n\r]+)',  # Charging at: ...
-            
-            # Full address patterns
-            r'([0-9-]+\s+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Drive|Dr|Highway|Hwy|Lane|Ln)[^<\n,]*,\s*[A-Za-z\s]+,\s*[A-Z]{2,3}\s*[0-9]{4})',
-            r'([A-Za-z\s]+,\s*[A-Z]{2,3}\s*[0-9]{4})',  # Suburb, STATE 1234
-            
-            # Service center without full address
-            r'([A-Za-z\s]+Service\s+Centre)',  # Just the service center name
-        ]
-        
-        for pattern in evie_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        use_re2 = self._use_re2(text)
+        anchors = self.prescan(text)
+        for literals, pattern in _LOCATION_PATTERNS:
+            if not any(literal in anchors for literal in literals):
+                continue
+            match = _search(pattern, text, use_re2=use_re2)
             if match:
                 if len(match.groups()) > 1:
                     # Combine multiple groups for full location
@@ -153,10 +463,8 @@ class EVIEParser(BaseParser):
                 else:
                     location = match.group(1).strip()
                 
-                # Clean up the location
-                location = re.sub(r'<[^>]+>', '', location)  # Remove any HTML tags
-                location = location.replace('\n', ' ').replace('\r', ' ')
-                location = re.sub(r'\s+', ' ', location)  # Normalize whitespace
+                # Clean up the location (remove HTML tags, normalize whitespace) in one pass
+                location = _LOC_CLEAN_RE.sub(_clean_location_match, location)
                 location = location[:200]  # Limit length
                 
                 if location and len(location) > 5:
@@ -169,43 +477,29 @@ class EVIEParser(BaseParser):
     
     def extract_energy(self, text: str) -> Optional[float]:
         """Extract energy using EVIE specific patterns optimized for HTML content."""
-        # Enhanced EVIE specific energy patterns
-        evie_patterns = [
-            # Primary EVIE energy patterns
-            r'Total\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Total Energy: 26.4047 kWh
-            r'Energy\s+Consumed[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Energy Consumed: 26.4047 kWh
-            r'Energy\s+Delivered[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Energy Delivered: 26.4047 kWh
-            r'kWh\s+Delivered[:\s]*([0-9]+\.[0-9]+)',  # kWh Delivered: 26.4047
-            r'Session\s+Energy[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Session Energy: 26.4047 kWh
-            
-            # HTML table patterns
-            r'<td[^>]*>\s*(?:Energy|kWh)\s*</td>\s*<td[^>]*>\s*([0-9]+\.[0-9]+)',
-            r'<td[^>]*>\s*([0-9]+\.[0-9]+)\s*kWh\s*</td>',
-            
-            # General energy patterns with context
-            r'([0-9]+\.[0-9]+)\s*kWh\s*(?:delivered|consumed|charged)',  # X.X kWh delivered
-            r'(?:Charged|Delivered)[:\s]*([0-9]+\.[0-9]+)\s*kWh',  # Charged: X.X kWh
-            
-            # Energy with pricing context (to distinguish from rates)
-            r'([0-9]+\.[0-9]+)\s*kWh\s*@\s*\$[0-9]+\.[0-9]+',  # X.X kWh @ $0.XX
-            r'([0-9]+\.[0-9]+)\s*kWh\s*(?:for|total)',  # X.X kWh for/total
-            
-            # Standard patterns (be more specific for EVIE)
-            r'([0-9]+\.[0-9]{3,4})\s*kWh',  # Match longer decimal precision typical of EVIE
-            r'(\d+\.\d+)\s*kWh(?!\s*(?:rate|per|@|\$))',  # kWh not followed by rate indicators
-        ]
+        use_re2 = self._use_re2(text)
+        union_match = _search(_ENERGY_UNION, text, use_re2=use_re2)
+        if union_match is None:
+            return super().extract_energy(text)
+        start = union_match.start()
         
-        for pattern in evie_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        anchors = self.prescan(text)
+        for literals, pattern in _ENERGY_PATTERNS:
+            if not any(literal in anchors for literal in literals):
+                continue
+            match = _search(pattern, text, start, use_re2=use_re2)
             if match:
+                energy_str = match.group(1)
+                if energy_str.startswith('0.') and energy_str[2:3] < '5':
+                    continue  # Under 0.5 kWh - more likely a per-kWh rate, rejected without converting
                 try:
-                    energy_value = float(match.group(1))
+                    energy_value = float(energy_str)
                     # Validate reasonable energy range
                     if 0.1 < energy_value < 200:  # Reasonable range for charging session
                         # Additional validation: ensure it's not a rate (rates are usually < 1.0)
                         if energy_value >= 1.0 or energy_value > 0.5:  # Most sessions > 0.5 kWh
                             if self.verbose_logging:
-                                _LOGGER.debug("Found EVIE energy: %.4f kWh using pattern: %s", energy_value, pattern)
+                                _LOGGER.debug("Found EVIE energy: %.4f kWh using pattern: %s", energy_value, pattern.pattern)
                             return energy_value
                 except (ValueError, IndexError):
                     continue
@@ -215,36 +509,17 @@ class EVIEParser(BaseParser):
     
     def extract_duration(self, text: str) -> Optional[str]:
         """Extract duration using EVIE specific patterns optimized for HTML content."""
-        # Enhanced EVIE specific duration patterns
-        evie_patterns = [
-            # Primary EVIE duration patterns
-            r'Charging\s+Time[:\s]*(\d+)m(?:in(?:ute)?s?)?',  # Charging Time: 13m
-            r'Session\s+Duration[:\s]*(\d+:\d+(?::\d+)?)',  # Session Duration: 00:13:45
-            r'Duration[:\s]*(\d+\s+minutes?)',  # Duration: 13 minutes
-            r'Total\s+Time[:\s]*(\d+:\d+(?::\d+)?)',  # Total Time: 00:13:45
-            
-            # HTML table patterns
-            r'<td[^>]*>\s*(?:Duration|Time)\s*</td>\s*<td[^>]*>\s*(\d+:\d+(?::\d+)?)',
-            r'<td[^>]*>\s*(\d+\s*(?:minutes?|mins?|hours?))\s*</td>',
-            
-            # Time format patterns
-            r'(\d{2}:\d{2}:\d{2})',  # HH:MM:SS
-            r'(\d{1,2}:\d{2})',  # H:MM or HH:MM
-            
-            # Minutes format
-            r'(\d+)\s*(?:minutes?|mins?|m)(?!\s*(?:ago|before|after))',  # X minutes (not relative time)
-            r'Session\s+(?:time|length)[:\s]*(\d+)\s*(?:minutes?|mins?)',  # Session time: X minutes
-            
-            # Hours and minutes combined
-            r'(\d+)\s*(?:hours?|hrs?|h)\s*(?:and\s*)?(\d+)?\s*(?:minutes?|mins?|m)?',  # X hours Y minutes
-            r'(\d+)h\s*(\d+)?m',  # Xh Ym format
-            
-            # Session timing
-            r'Started[^<\n]*?(\d{1,2}:\d{2}).*?(?:Ended|Finished)[^<\n]*?(\d{1,2}:\d{2})',  # Start and end times
-        ]
+        use_re2 = self._use_re2(text)
+        union_match = _search(_DURATION_UNION, text, use_re2=use_re2)
+        if union_match is None:
+            return super().extract_duration(text)
+        start = union_match.start()
         
-        for pattern in evie_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        anchors = self.prescan(text)
+        for literals, pattern in _DURATION_PATTERNS:
+            if not any(literal in anchors for literal in literals):
+                continue
+            match = _search(pattern, text, start, use_re2=use_re2)
             if match:
                 if len(match.groups()) > 1 and match.group(2):
                     # Handle patterns with hours and minutes
@@ -258,10 +533,10 @@ class EVIEParser(BaseParser):
                     duration = match.group(1).strip()
                 
                 # Clean HTML from duration
-                duration = re.sub(r'<[^>]+>', '', duration)
+                duration = _HTML_TAG_RE.sub('', duration)
                 
                 if self.verbose_logging:
-                    _LOGGER.debug("Found EVIE duration: %s using pattern: %s", duration, pattern)
+                    _LOGGER.debug("Found EVIE duration: %s using pattern: %s", duration, pattern.pattern)
                 return duration
         
         # Fallback to general patterns
@@ -269,89 +544,37 @@ class EVIEParser(BaseParser):
     
     def extract_date(self, text: str):
         """Extract date using EVIE specific patterns optimized for HTML content."""
-        # Enhanced EVIE specific date patterns
-        evie_date_patterns = [
-            # EVIE typical patterns from HTML emails
-            r'([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\s+at\s+(\d{1,2}:\d{2}:\d{2}\s*[AP]M\s*[A-Z]{3,4})',  # July 4, 2025 at 7:54:13 PM AEST
-            r'Session\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Session Date: July 4, 2025
-            r'Charging\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Charging Date: July 4, 2025
-            
-            # HTML table date patterns
-            r'<td[^>]*>\s*(?:Date|Session Date)\s*</td>\s*<td[^>]*>\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',
-            r'<td[^>]*>\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})\s*</td>',
-            
-            # Alternative date formats
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})\s+at\s+(\d{1,2}:\d{2})',  # DD/MM/YYYY at HH:MM
-            r'(\d{4}-\d{1,2}-\d{1,2})\s+(\d{1,2}:\d{2})',  # YYYY-MM-DD HH:MM
-            
-            # Receipt/Invoice date patterns
-            r'Receipt\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Receipt Date: July 4, 2025
-            r'Invoice\s+Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Invoice Date: July 4, 2025
-            r'Tax\s+Invoice[^<\n]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Tax Invoice ... July 4, 2025
-            
-            # Date in email headers or timestamps
-            r'Date[:\s]*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # Date: July 4, 2025
-            
-            # Standalone date patterns
-            r'([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})',  # July 4, 2025
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})',  # DD/MM/YYYY or MM/DD/YYYY
-            r'(\d{4}-\d{1,2}-\d{1,2})',  # YYYY-MM-DD
-        ]
-        
+        use_re2 = self._use_re2(text)
+        anchors = self.prescan(text)
         # Try EVIE specific patterns first
-        for pattern in evie_date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for literals, pattern in _DATE_PATTERNS:
+            if not any(literal in anchors for literal in literals):
+                continue
+            match = _search(pattern, text, use_re2=use_re2)
             if match:
-                try:
-                    date_str = match.group(1).strip()
-                    
-                    # Clean HTML from date string
-                    date_str = re.sub(r'<[^>]+>', '', date_str)
-                    
-                    # Parse the date
-                    if pd:
-                        try:
-                            # For EVIE, expect formats like "July 4, 2025" or "04/07/2025"
-                            if re.match(r'^[A-Za-z]', date_str):
-                                # Month name format (July 4, 2025)
-                                session_date = pd.to_datetime(date_str, errors='coerce')
-                            else:
-                                # Numeric format - try Australian format first (DD/MM/YYYY)
-                                session_date = pd.to_datetime(date_str, dayfirst=True, errors='coerce')
-                            
-                            if pd.notna(session_date):
-                                if self.verbose_logging:
-                                    _LOGGER.debug("Found EVIE date: %s -> %s", date_str, session_date)
-                                return session_date.to_pydatetime()
-                        except:
-                            pass
-                    
-                    # Fallback manual parsing
-                    try:
-                        # Try common formats
-                        formats = [
-                            '%B %d, %Y',  # July 4, 2025
-                            '%b %d, %Y',   # Jul 4, 2025
-                            '%d/%m/%Y',    # 04/07/2025 (Australian)
-                            '%m/%d/%Y',    # 07/04/2025 (US)
-                            '%Y-%m-%d',    # 2025-07-04
-                        ]
-                        
-                        for fmt in formats:
-                            try:
-                                session_date = datetime.strptime(date_str, fmt)
-                                if self.verbose_logging:
-                                    _LOGGER.debug("Found EVIE date with format %s: %s -> %s", fmt, date_str, session_date)
-                                return session_date
-                            except ValueError:
-                                continue
-                    except:
-                        pass
+                date_str = match.group(1).strip()
+                
+                # Clean HTML from date string
+                date_str = _HTML_TAG_RE.sub('', date_str)
                 
-                except Exception as e:
+                # Parse the date with the one format its shape allows
+                date_format = _date_format(date_str)
+                if date_format is None:
+                    continue
+                try:
+                    if date_str[:1].isalpha():
+                        # The usual EVIE form, read without going through strptime
+                        session_date = _parse_month_name_date(date_str)
+                    else:
+                        session_date = datetime.strptime(date_str, date_format)
+                except ValueError as e:
                     if self.verbose_logging:
                         _LOGGER.debug("Date parsing failed for '%s': %s", date_str, e)
                     continue
+                
+                if self.verbose_logging:
+                    _LOGGER.debug("Found EVIE date with format %s: %s -> %s", date_format, date_str, session_date)
+                return session_date
         
         # Fallback to base parser
         return super().extract_date(text)
\ No newline at end of file
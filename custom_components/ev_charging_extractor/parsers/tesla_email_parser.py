@@ -26,10 +26,10 @@ class TeslaEmailParser(BaseParser):
         """Return the provider name."""
         return "Tesla"
     
-    def can_parse(self, sender: str, subject: str) -> bool:
+    def can_parse(self, sender: str, subject: str, lowered: bool = False) -> bool:
         """Check if this parser can handle the email."""
-        sender_lower = sender.lower()
-        subject_lower = subject.lower()
+        sender_lower = sender if lowered else sender.lower()
+        subject_lower = subject if lowered else subject.lower()
         
         # Check for specific Tesla email pattern from stevelea@gmail.com
         return (
@@ -3,12 +3,15 @@ import os
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
 
 from ..models import ChargingReceipt
 
 _LOGGER = logging.getLogger(__name__)
 
+# user_version once processed_emails no longer needs its SHA-256 keys migrated to BLAKE2b
+_EMAIL_HASH_MIGRATED_VERSION = 1
+
 
 class DatabaseManager:
     """Manages SQLite database operations for EV charging data including Tesla PDFs."""
@@ -16,6 +19,7 @@ class DatabaseManager:
     def __init__(self, db_path: str):
         """Initialize database manager."""
         self.db_path = db_path
+        self._email_hash_migrated = False
         self.setup_database()
     
     def setup_database(self):
@@ -383,6 +387,117 @@ class DatabaseManager:
             _LOGGER.error("Error checking if email processed: %s", e)
             return False
     
+    def get_processed_set(self, email_hashes: List[str]) -> Set[str]:
+        """Return which of the given email hashes have already been processed."""
+        processed = set()
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Stay under SQLite's limit on bound parameters per statement
+            for start in range(0, len(email_hashes), 500):
+                chunk = email_hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f'SELECT email_hash FROM processed_emails WHERE email_hash IN ({placeholders})', chunk
+                )
+                processed.update(row[0] for row in cursor.fetchall())
+            
+            conn.close()
+            
+        except Exception as e:
+            _LOGGER.error("Error checking processed emails: %s", e)
+        
+        return processed
+    
+    def get_processed_subjects(self, email_hashes: List[str]) -> Dict[str, str]:
+        """Return {email_hash: stored subject} for the given hashes that have been processed."""
+        subjects = {}
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            # Stay under SQLite's limit on bound parameters per statement
+            for start in range(0, len(email_hashes), 500):
+                chunk = email_hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f'SELECT email_hash, email_subject FROM processed_emails WHERE email_hash IN ({placeholders})', chunk
+                )
+                subjects.update((row[0], row[1] or "") for row in cursor.fetchall())
+            
+            conn.close()
+            
+        except Exception as e:
+            _LOGGER.error("Error checking processed emails: %s", e)
+        
+        return subjects
+    
+    def needs_email_hash_migration(self) -> bool:
+        """Check if processed emails may still be keyed by their old SHA-256 hash.
+        
+        The migration runs once; its completion is recorded in the database's user_version.
+        """
+        if self._email_hash_migrated:
+            return False
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('PRAGMA user_version')
+            migrated = cursor.fetchone()[0] >= _EMAIL_HASH_MIGRATED_VERSION
+            if not migrated:
+                # SHA-256 hex digests are 64 characters, the BLAKE2b keys 32
+                cursor.execute('SELECT 1 FROM processed_emails WHERE length(email_hash) = 64 LIMIT 1')
+                if cursor.fetchone() is None:
+                    cursor.execute(f'PRAGMA user_version = {_EMAIL_HASH_MIGRATED_VERSION}')
+                    conn.commit()
+                    migrated = True
+            
+            conn.close()
+            self._email_hash_migrated = migrated
+            return not migrated
+            
+        except Exception as e:
+            _LOGGER.error("Error checking processed email migration: %s", e)
+            return False
+    
+    def mark_email_hash_migrated(self) -> bool:
+        """Record that the SHA-256 to BLAKE2b migration of processed emails has run."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute(f'PRAGMA user_version = {_EMAIL_HASH_MIGRATED_VERSION}')
+            
+            conn.commit()
+            conn.close()
+            self._email_hash_migrated = True
+            return True
+            
+        except Exception as e:
+            _LOGGER.error("Error recording processed email migration: %s", e)
+            return False
+    
+    def mark_emails_processed(self, entries: Iterable[Tuple[str, str]]) -> bool:
+        """Mark several emails as processed from (email_hash, subject) pairs."""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO processed_emails (email_hash, email_subject)
+                VALUES (?, ?)
+            ''', entries)
+            
+            conn.commit()
+            conn.close()
+            return True
+            
+        except Exception as e:
+            _LOGGER.error("Error marking emails as processed: %s", e)
+            return False
+    
     def is_tesla_pdf_processed(self, pdf_hash: str) -> bool:
         """Check if Tesla PDF has been processed."""
         try:
@@ -1,9 +1,14 @@
 """Email processor for EV charging receipts with fixed imports."""
+import functools
 import imaplib
 import logging
 import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
+from typing import List, Dict, Optional, Tuple
 
 from ..models import ProviderMapping
 from ..utils.email_utils import EmailUtils  # Fixed import
@@ -12,6 +17,31 @@ from .database_manager import DatabaseManager
 
 _LOGGER = logging.getLogger(__name__)
 
+# Message-ID header (possibly folded onto the next line), searched in the header block only
+_MESSAGE_ID_RE = re.compile(rb'^Message-ID:\s*(<[^>\s]+>)', re.IGNORECASE | re.MULTILINE)
+
+# Domain part of the (last) address in a lowercased From header
+_SENDER_DOMAIN_RE = re.compile(r'[a-z0-9.-]+')
+
+# Threads used to parse fetched emails in process_emails
+_PARSE_WORKERS = 4
+
+
+def _dedupe_key(email_bytes: bytes) -> bytes:
+    """Return the Message-ID of a raw email, or a hash of the body when it has none."""
+    header_end = email_bytes.find(b'\r\n\r\n')
+    if header_end < 0:
+        header_end = email_bytes.find(b'\n\n')
+    match = _MESSAGE_ID_RE.search(email_bytes, 0, header_end if header_end >= 0 else len(email_bytes))
+    if match:
+        return match.group(1)
+    return hashlib.blake2b(email_bytes, digest_size=16).digest()
+
+
+def _header_str(headers, name: str) -> str:
+    """Return a header as plain text, decoding encoded words and raw 8-bit values (Header objects)."""
+    return str(make_header(decode_header(headers.get(name) or '')))
+
 
 class EmailProcessor:
     """Handles email fetching and processing for EV charging receipts."""
@@ -33,6 +63,17 @@ class EmailProcessor:
             AmpolParser(default_currency, verbose_logging),
             # Add more parsers here as needed
         ]
+        
+        # Sender domain -> parser, so most emails are dispatched with a lookup rather
+        # than by asking every parser in turn
+        self._parsers_by_domain = {}
+        for parser in self.parsers:
+            for domain in parser.sender_domains():
+                self._parsers_by_domain.setdefault(domain, parser)
+        
+        # can_parse only looks at sender and subject, and receipts from one provider keep
+        # repeating the same pair, so dispatch decisions are cached per processor
+        self._cached_find_parser = functools.lru_cache(maxsize=512)(self._find_parser)
     
     def connect_to_gmail(self) -> Optional[imaplib.IMAP4_SSL]:
         """Connect to Gmail via IMAP."""
@@ -48,8 +89,13 @@ class EmailProcessor:
             _LOGGER.error("Error connecting to Gmail: %s", e)
             return None
     
-    def get_charging_emails(self, mail: imaplib.IMAP4_SSL, days_back: int = 30) -> List[bytes]:
-        """Fetch emails from charging providers."""
+    def get_charging_emails(self, mail: imaplib.IMAP4_SSL, days_back: int = 30,
+                            only_parseable: bool = True) -> List[bytes]:
+        """Fetch emails from charging providers.
+        
+        With only_parseable, headers are fetched first and full messages are only
+        downloaded for emails one of the parsers accepts.
+        """
         try:
             mail.select('inbox')
             
@@ -59,6 +105,7 @@ class EmailProcessor:
                 _LOGGER.info("Searching emails since %s (%d days back)", date_since, days_back)
             
             all_emails = []
+            seen_message_ids = set()
             search_terms = ProviderMapping.get_search_terms()
             
             for term in search_terms:
@@ -71,23 +118,26 @@ class EmailProcessor:
                         if len(email_ids) > 0 and self.verbose_logging:
                             _LOGGER.debug("Found %d emails from search: %s", len(email_ids), term)
                         
-                        for email_id in email_ids[:10]:  # Limit emails per search
-                            result, msg_data = mail.fetch(email_id, '(RFC822)')
-                            if result == 'OK':
-                                all_emails.append(msg_data[0][1])
+                        email_ids = email_ids[:10]  # Limit emails per search
+                        if only_parseable:
+                            email_ids = self._select_parseable(mail, email_ids, seen_message_ids)
+                        
+                        # Fetched in one round trip
+                        all_emails.extend(self._fetch_messages(mail, email_ids, '(BODY.PEEK[])'))
                                 
                 except Exception as e:
                     if self.verbose_logging:
                         _LOGGER.warning("Error with search '%s': %s", term, e)
             
-            # Remove duplicates
+            # Remove duplicates (the same email is often found by several search terms).
+            # Keyed on the Message-ID so only the header block is scanned, not the body.
             unique_emails = []
             seen_ids = set()
             
             for email_bytes in all_emails:
-                email_hash = hashlib.sha256(email_bytes).hexdigest()
-                if email_hash not in seen_ids:
-                    seen_ids.add(email_hash)
+                email_key = _dedupe_key(email_bytes)
+                if email_key not in seen_ids:
+                    seen_ids.add(email_key)
                     unique_emails.append(email_bytes)
             
             _LOGGER.info("Found %d unique charging emails", len(unique_emails))
@@ -97,6 +147,62 @@ class EmailProcessor:
             _LOGGER.error("Error getting charging emails: %s", e)
             return []
     
+    @staticmethod
+    def _fetch_messages(mail: imaplib.IMAP4_SSL, email_ids: List[bytes], message_parts: str) -> List[bytes]:
+        """Fetch one message part for several emails with a single FETCH command."""
+        if not email_ids:
+            return []
+        
+        result, msg_data = mail.fetch(b','.join(email_ids), message_parts)
+        if result != 'OK':
+            return []
+        
+        # The reply interleaves (envelope, payload) tuples with closing b')' lines
+        return [item[1] for item in msg_data if isinstance(item, tuple)]
+    
+    def _select_parseable(self, mail: imaplib.IMAP4_SSL, email_ids: List[bytes], seen_message_ids: set) -> List[bytes]:
+        """Return the ids of emails a parser accepts, based on their headers only.
+        
+        Emails whose Message-ID was already selected (by an earlier search term) are skipped.
+        """
+        if not email_ids:
+            return []
+        
+        result, msg_data = mail.fetch(b','.join(email_ids), '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT MESSAGE-ID)])')
+        if result != 'OK':
+            return []
+        
+        header_parser = BytesHeaderParser()
+        selected = []
+        for item in msg_data:
+            if not isinstance(item, tuple):
+                continue
+            
+            try:
+                headers = header_parser.parsebytes(item[1])
+                sender = _header_str(headers, 'from')
+                subject = _header_str(headers, 'subject')
+                message_id = _header_str(headers, 'message-id').strip()
+                parser = self.find_parser(sender, subject)
+            except Exception as e:
+                _LOGGER.warning("Skipping email with unreadable headers: %s", e)
+                continue
+            
+            if not parser:
+                if self.verbose_logging:
+                    _LOGGER.debug("Skipping email without a matching parser: %s", subject)
+                continue
+            
+            if message_id:
+                if message_id in seen_message_ids:
+                    continue
+                seen_message_ids.add(message_id)
+            
+            # Envelope looks like b'12 (BODY[HEADER.FIELDS (FROM SUBJECT MESSAGE-ID)] {95}'
+            selected.append(item[0].split(None, 1)[0])
+        
+        return selected
+    
     def process_emails(self, days_back: int = 30) -> Dict[str, int]:
         """Process charging emails and extract receipts."""
         results = {
@@ -111,53 +217,62 @@ class EmailProcessor:
             
             emails = self.get_charging_emails(mail, days_back)
             
-            for i, raw_email in enumerate(emails):
-                try:
-                    # Check if email already processed
-                    email_hash = hashlib.sha256(raw_email).hexdigest()
-                    if self.database_manager.is_email_processed(email_hash):
+            # Check which emails were already processed with one query, and collect the
+            # ones processed in this run to mark them in one go
+            email_hashes = [hashlib.blake2b(raw_email, digest_size=16).hexdigest() for raw_email in emails]
+            processed_hashes = self._get_processed_hashes(emails, email_hashes)
+            newly_processed = []
+            
+            # Parsing is independent per email, so it runs on a small thread pool. Results are
+            # consumed in order below, which keeps all database access on this thread.
+            with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as executor:
+                parse_futures = [
+                    None if email_hash in processed_hashes else executor.submit(self._parse_email, raw_email)
+                    for raw_email, email_hash in zip(emails, email_hashes)
+                ]
+                
+                for i, parse_future in enumerate(parse_futures):
+                    try:
+                        # Check if email already processed
+                        email_hash = email_hashes[i]
+                        if email_hash in processed_hashes:
+                            if self.verbose_logging:
+                                _LOGGER.debug("Skipping already processed email %d", i+1)
+                            continue
+                        
+                        email_data, parser, receipt = parse_future.result()
+                        
                         if self.verbose_logging:
-                            _LOGGER.debug("Skipping already processed email %d", i+1)
-                        continue
-                    
-                    # Parse email content
-                    email_data = EmailUtils.parse_email_content(raw_email, self.verbose_logging)
-                    
-                    if self.verbose_logging:
-                        _LOGGER.info("Processing email %d/%d from %s", 
-                                   i+1, len(emails), email_data['sender'])
-                    
-                    # Find appropriate parser
-                    parser = self.find_parser(email_data['sender'], email_data['subject'])
-                    
-                    if parser:
-                        receipt = parser.parse_receipt(email_data)
+                            _LOGGER.info("Processing email %d/%d from %s", 
+                                       i+1, len(emails), email_data['sender'])
                         
-                        if receipt:
-                            if self.database_manager.save_receipt(receipt, 'email'):
-                                results['new_email_receipts'] += 1
-                                _LOGGER.info("Successfully processed email from %s: $%.2f", 
-                                           email_data['sender'], receipt.cost)
-                                
-                                # Mark email as processed
-                                self.database_manager.mark_email_processed(
-                                    email_hash, email_data['subject']
-                                )
+                        if parser:
+                            if receipt:
+                                if self.database_manager.save_receipt(receipt, 'email'):
+                                    results['new_email_receipts'] += 1
+                                    _LOGGER.info("Successfully processed email from %s: $%.2f", 
+                                               email_data['sender'], receipt.cost)
+                                    
+                                    # Mark email as processed
+                                    newly_processed.append((email_hash, email_data['subject']))
+                                    processed_hashes.add(email_hash)
+                            else:
+                                if self.verbose_logging:
+                                    _LOGGER.debug("No receipt data extracted from email %d", i+1)
                         else:
                             if self.verbose_logging:
-                                _LOGGER.debug("No receipt data extracted from email %d", i+1)
-                    else:
-                        if self.verbose_logging:
-                            _LOGGER.debug("No parser found for email from %s", email_data['sender'])
+                                _LOGGER.debug("No parser found for email from %s", email_data['sender'])
+                            
+                            # Mark as processed even if no parser found to avoid reprocessing
+                            newly_processed.append((email_hash, email_data['subject']))
+                            processed_hashes.add(email_hash)
                         
-                        # Mark as processed even if no parser found to avoid reprocessing
-                        self.database_manager.mark_email_processed(
-                            email_hash, email_data['subject']
-                        )
-                    
-                except Exception as e:
-                    _LOGGER.error("Error processing email %d: %s", i+1, e)
-                    results['errors'].append(str(e))
+                    except Exception as e:
+                        _LOGGER.error("Error processing email %d: %s", i+1, e)
+                        results['errors'].append(str(e))
+            
+            if newly_processed:
+                self.database_manager.mark_emails_processed(newly_processed)
             
             mail.logout()
             
@@ -167,11 +282,79 @@ class EmailProcessor:
         
         return results
     
+    def _parse_email(self, raw_email: bytes) -> Tuple[Dict, Optional[object], Optional[object]]:
+        """Parse one raw email into (email_data, parser, receipt); runs on the parse thread pool."""
+        # Parse email content
+        email_data = EmailUtils.parse_email_content(raw_email, self.verbose_logging)
+        
+        # Find appropriate parser
+        parser = self.find_parser(email_data['sender'], email_data['subject'])
+        receipt = parser.parse_receipt(email_data) if parser else None
+        return email_data, parser, receipt
+    
+    def _get_processed_hashes(self, emails: List[bytes], email_hashes: List[str]) -> set:
+        """Return the hashes of already processed emails, migrating entries stored under the old SHA-256 key."""
+        processed = self.database_manager.get_processed_set(email_hashes)
+        
+        # Emails processed before the switch to BLAKE2b are keyed by their SHA-256 hash. The
+        # fetched emails are re-keyed once, on the first run after the switch.
+        if self.database_manager.needs_email_hash_migration():
+            legacy_hashes = {
+                hashlib.sha256(raw_email).hexdigest(): email_hash
+                for raw_email, email_hash in zip(emails, email_hashes)
+                if email_hash not in processed
+            }
+            if legacy_hashes:
+                subjects = self.database_manager.get_processed_subjects(list(legacy_hashes))
+                if subjects:
+                    self.database_manager.mark_emails_processed(
+                        (legacy_hashes[legacy], subject) for legacy, subject in subjects.items()
+                    )
+                    processed.update(legacy_hashes[legacy] for legacy in subjects)
+            self.database_manager.mark_email_hash_migrated()
+        
+        return processed
+    
     def find_parser(self, sender: str, subject: str) -> Optional[object]:
         """Find appropriate parser for the email."""
+        # Headers with raw 8-bit characters come back as email.header.Header objects, which
+        # cannot be cache keys - str() decodes them
+        if not isinstance(sender, str):
+            sender = str(sender)
+        if not isinstance(subject, str):
+            subject = str(subject)
+        return self._cached_find_parser(sender, subject)
+    
+    def _find_parser(self, sender: str, subject: str) -> Optional[object]:
+        """Ask the parsers for the email, starting with the one registered for the sender's domain."""
+        # Lowercase once rather than in every parser's can_parse
+        sender_lower = sender.lower()
+        subject_lower = subject.lower()
+        
+        parser = self._parser_for_sender_domain(sender_lower)
+        if parser is not None and parser.can_parse(sender_lower, subject_lower, lowered=True):
+            return parser
+        
         for parser in self.parsers:
-            if parser.can_parse(sender, subject):
+            if parser.can_parse(sender_lower, subject_lower, lowered=True):
+                return parser
+        return None
+    
+    def _parser_for_sender_domain(self, sender_lower: str) -> Optional[object]:
+        """Return the parser registered for the sender's domain or one of its parent domains."""
+        at = sender_lower.rfind('@')
+        if at < 0:
+            return None
+        match = _SENDER_DOMAIN_RE.match(sender_lower, at + 1)
+        if match is None:
+            return None
+        
+        domain = match.group()
+        while domain:
+            parser = self._parsers_by_domain.get(domain)
+            if parser is not None:
                 return parser
+            domain = domain.partition('.')[2]
         return None
     
     def debug_email_parsing(self, days_back: int = 7):
@@ -182,7 +365,8 @@ class EmailProcessor:
                 _LOGGER.error("Could not connect to Gmail for debugging")
                 return
             
-            emails = self.get_charging_emails(mail, days_back)
+            # Include emails no parser accepts so they show up in the debug output
+            emails = self.get_charging_emails(mail, days_back, only_parseable=False)
             _LOGGER.info("Found %d emails for debugging", len(emails))
             
             for i, raw_email in enumerate(emails[:3]):  # Debug first 3 emails
@@ -1,19 +1,126 @@
 """Email utilities for parsing and processing with enhanced HTML support."""
 import email
+import functools
+import hashlib
 import logging
-from typing import Dict, Optional
+import re
+import threading
+from collections import OrderedDict
+from html import unescape
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
 
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
     import PyPDF2
     import io
 except ImportError:
-    BeautifulSoup = None
+    BeautifulSoup = SoupStrainer = None
     PyPDF2 = None
     io = None
 
+try:
+    import lxml  # BeautifulSoup's 'lxml' tree builder
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode  # C (lexbor) HTML parser, preferred over BeautifulSoup
+    
+    # _single_string needs the node API of selectolax 1.x; older releases use BeautifulSoup instead
+    if not all(hasattr(LexborNode, name) for name in ('is_comment_node', 'comment_content', 'text_content')):
+        LexborHTMLParser = None
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import pypdfium2 as pdfium  # native PDFium text extraction, preferred over PyPDF2
+except ImportError:
+    pdfium = None
+
+# PDFium is not thread-safe; every pypdfium2 call goes through this lock
+_pdfium_lock = threading.Lock()
+
 _LOGGER = logging.getLogger(__name__)
 
+# extract_html_content results (LRU), keyed by (BLAKE2b digest of the HTML, provider hint).
+# Emails are parsed on a thread pool, hence the lock.
+_HTML_TEXT_CACHE_SIZE = 128
+_html_text_cache = OrderedDict()
+_html_text_cache_lock = threading.Lock()
+
+# With lxml, only the body and the containers receipts are laid out in are built into the
+# tree - <head> and everything in it is skipped while parsing
+_CONTENT_STRAINER = SoupStrainer(['div', 'td', 'table', 'body', 'tr', 'p', 'h1', 'h2', 'h3']) if SoupStrainer else None
+
+# Class names that mark a receipt's main content container (EVIE and BP Pulse extraction)
+_CONTENT_CLASS_RE = re.compile(r'content|main|body|receipt|invoice', re.IGNORECASE)
+
+# EVIE extraction: receipt keywords that mark a table/div holding receipt data when no main
+# content container exists
+_EVIE_RECEIPT_KEYWORDS = ('receipt', 'invoice', 'total', 'amount', 'energy')
+
+# Patterns for _simple_html_strip
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_BLOCK_OPEN_RE = re.compile(r'<(?:div|p|br|tr|table|h[1-6])[^>]*>', re.IGNORECASE)
+_BLOCK_CLOSE_RE = re.compile(r'</(?:div|p|tr|table|h[1-6])>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Footer/header boilerplate dropped by _clean_extracted_text, matched in one pass per line
+_SKIP_PATTERNS = (
+    'unsubscribe',
+    'privacy policy',
+    'terms and conditions',
+    'view this email',
+    'download our app',
+    'follow us',
+    'social media',
+    'customer service',
+    'help center',
+)
+_SKIP_RE = re.compile('|'.join(map(re.escape, _SKIP_PATTERNS)))
+
+
+def _clean_line_re(min_len: int):
+    """Compile the _clean_extracted_text pattern capturing each stripped line of min_len+ chars.
+    
+    Lines that are URLs or a bare email address (a single word containing '@') are skipped.
+    """
+    return re.compile(
+        r'^[^\S\n]*'
+        r'(?!http|www\.|mailto:)'
+        r'(?!\S*@\S*[^\S\n]*$)'
+        r'(\S[^\n]{%d,}\S)'
+        r'[^\S\n]*$' % (min_len - 2),
+        re.MULTILINE,
+    )
+
+
+_CLEAN_LINE_RE_EVIE = _clean_line_re(2)
+_CLEAN_LINE_RE_OTHER = _clean_line_re(3)
+
+
+@functools.lru_cache(maxsize=256)
+def _provider_hint(sender: str) -> str:
+    """Return the provider hint for a From header, or "" when it names no known provider.
+    
+    Checked in priority order. 'goevie' and 'bppulse' need no checks of their own, as they
+    contain 'evie' and 'bp'.
+    """
+    sender_lower = sender.lower()
+    if "evie" in sender_lower:
+        return "evie"
+    if "bp" in sender_lower:
+        return "bppulse"
+    if "chargefox" in sender_lower:
+        return "chargefox"
+    if "ampol" in sender_lower or "ampcharge" in sender_lower:
+        return "ampol"
+    return ""
+
 
 class EmailUtils:
     """Utility class for email processing with HTML support."""
@@ -21,6 +128,9 @@ class EmailUtils:
     @staticmethod
     def extract_pdf_text(pdf_data: bytes) -> str:
         """Extract text from PDF attachment."""
+        if pdfium:
+            return EmailUtils._extract_pdf_text_pdfium(pdf_data)
+        
         try:
             if not PyPDF2:
                 _LOGGER.warning("PyPDF2 not available, cannot process PDF attachments")
@@ -29,58 +139,137 @@ class EmailUtils:
             pdf_file = io.BytesIO(pdf_data)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             
-            text = ""
+            page_texts = []
             for page in pdf_reader.pages:
                 try:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
+                        page_texts.append(page_text)
                 except Exception as e:
                     _LOGGER.warning("Error extracting text from PDF page: %s", e)
                     continue
             
-            return text
+            return "\n".join(page_texts) + "\n" if page_texts else ""
         except Exception as e:
             _LOGGER.error("Error processing PDF: %s", e)
             return ""
     
+    @staticmethod
+    def _extract_pdf_text_pdfium(pdf_data: bytes) -> str:
+        """Extract text from PDF attachment with pypdfium2.
+        
+        PDFium is not thread-safe and emails are parsed on thread pools, so the lock is held from
+        opening the document until it is closed.
+        """
+        with _pdfium_lock:
+            try:
+                pdf = pdfium.PdfDocument(pdf_data)
+            except Exception as e:
+                _LOGGER.error("Error processing PDF: %s", e)
+                return ""
+            
+            try:
+                page_texts = []
+                for index in range(len(pdf)):
+                    try:
+                        page = pdf[index]
+                        try:
+                            textpage = page.get_textpage()
+                            try:
+                                # PDFium ends lines with \r\n
+                                page_text = textpage.get_text_range().replace('\r\n', '\n')
+                            finally:
+                                textpage.close()
+                        finally:
+                            page.close()
+                        if page_text:
+                            page_texts.append(page_text)
+                    except Exception as e:
+                        _LOGGER.warning("Error extracting text from PDF page: %s", e)
+                        continue
+                
+                return "\n".join(page_texts) + "\n" if page_texts else ""
+            finally:
+                pdf.close()
+    
     @staticmethod
     def extract_html_content(html_content: str, provider_hint: str = "") -> str:
-        """Extract text content from HTML with provider-specific handling."""
+        """Extract text content from HTML with provider-specific handling.
+        
+        Cached, as templated receipts from one provider often repeat the same body. The cache is
+        keyed by a digest of the body and holds only the extracted text, so it stays small.
+        """
+        key = (hashlib.blake2b(html_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+               provider_hint)
+        with _html_text_cache_lock:
+            html_text = _html_text_cache.get(key)
+            if html_text is not None:
+                _html_text_cache.move_to_end(key)
+                return html_text
+        
+        html_text = EmailUtils._extract_html_content(html_content, provider_hint)
+        
+        with _html_text_cache_lock:
+            _html_text_cache[key] = html_text
+            if len(_html_text_cache) > _HTML_TEXT_CACHE_SIZE:
+                _html_text_cache.popitem(last=False)
+        return html_text
+    
+    @staticmethod
+    def _extract_html_content(html_content: str, provider_hint: str = "") -> str:
+        """Extract text content from HTML with provider-specific handling (uncached)."""
+        if LexborHTMLParser is not None:
+            return EmailUtils._extract_html_content_lexbor(html_content, provider_hint)
+        
         if not BeautifulSoup:
             _LOGGER.warning("BeautifulSoup not available, using simple HTML stripping")
             return EmailUtils._simple_html_strip(html_content)
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            if lxml is not None:
+                soup = BeautifulSoup(html_content, 'lxml', parse_only=_CONTENT_STRAINER)
+            else:
+                soup = BeautifulSoup(html_content, 'html.parser')
             
             # Remove script and style elements
             for script in soup(["script", "style", "meta", "link"]):
                 script.decompose()
             
             # Provider-specific content extraction
-            if "evie" in provider_hint.lower():
-                # EVIE specific handling - look for main content areas
-                main_content = soup.find(['div', 'td', 'table'], 
-                                       class_=lambda x: x and any(cls in str(x).lower() 
-                                                                for cls in ['content', 'main', 'body', 'receipt', 'invoice', 'email-body']))
+            hint = provider_hint.lower()
+            if "evie" in hint:
+                # EVIE specific handling - look for main content areas. One walk over the tree finds
+                # the first div/td/table with a main-content class and, until then, collects the
+                # tables/divs whose single string names a receipt field as the fallback
+                main_content = None
+                receipt_content = []
+                for element in soup.descendants:
+                    if element.name not in ('div', 'td', 'table'):
+                        continue
+                    
+                    classes = element.get('class')
+                    if classes:
+                        class_text = ' '.join(classes) if isinstance(classes, list) else classes
+                        if _CONTENT_CLASS_RE.search(class_text):
+                            main_content = element
+                            break
+                    
+                    if element.name != 'td':
+                        text = element.string
+                        if text and any(keyword in text.lower() for keyword in _EVIE_RECEIPT_KEYWORDS):
+                            receipt_content.append(element)
+                
                 if main_content:
                     html_text = main_content.get_text(separator='\n', strip=True)
+                elif receipt_content:
+                    # Fallback: tables or divs that might contain receipt data
+                    html_text = '\n'.join([elem.get_text(separator='\n', strip=True) for elem in receipt_content])
                 else:
-                    # Fallback: try to find tables or divs that might contain receipt data
-                    receipt_content = soup.find_all(['table', 'div'], 
-                                                  string=lambda text: text and any(keyword in text.lower() 
-                                                                                  for keyword in ['receipt', 'invoice', 'total', 'amount', 'energy']))
-                    if receipt_content:
-                        html_text = '\n'.join([elem.get_text(separator='\n', strip=True) for elem in receipt_content])
-                    else:
-                        html_text = soup.get_text(separator='\n', strip=True)
+                    html_text = soup.get_text(separator='\n', strip=True)
             
-            elif "bppulse" in provider_hint.lower() or "bp" in provider_hint.lower():
+            elif "bppulse" in hint or "bp" in hint:
                 # BP Pulse specific handling
-                main_content = soup.find(['div', 'td', 'table'], 
-                                       class_=lambda x: x and any(cls in str(x).lower() 
-                                                                for cls in ['content', 'main', 'body', 'receipt', 'invoice']))
+                main_content = soup.find(['div', 'td', 'table'], class_=_CONTENT_CLASS_RE)
                 if main_content:
                     html_text = main_content.get_text(separator='\n', strip=True)
                 else:
@@ -97,164 +286,171 @@ class EmailUtils:
             _LOGGER.error("Error extracting HTML content: %s", e)
             return EmailUtils._simple_html_strip(html_content)
     
+    @staticmethod
+    def _extract_html_content_lexbor(html_content: str, provider_hint: str = "") -> str:
+        """Extract text content from HTML with selectolax, mirroring the BeautifulSoup path."""
+        try:
+            tree = LexborHTMLParser(html_content)
+            
+            # Remove script and style elements
+            for node in tree.css('script, style, meta, link'):
+                node.decompose()
+            
+            root = tree.body or tree.root
+            
+            # Provider-specific content extraction
+            hint = provider_hint.lower()
+            if "evie" in hint:
+                # EVIE specific handling - the first div/td/table with a main-content class, else
+                # the tables/divs (before it) whose single string names a receipt field
+                main_content = None
+                receipt_content = []
+                for node in root.traverse():
+                    if node.tag not in ('div', 'td', 'table'):
+                        continue
+                    
+                    classes = node.attributes.get('class')
+                    if classes and _CONTENT_CLASS_RE.search(classes):
+                        main_content = node
+                        break
+                    
+                    if node.tag != 'td':
+                        text = _single_string(node)
+                        if text and any(keyword in text.lower() for keyword in _EVIE_RECEIPT_KEYWORDS):
+                            receipt_content.append(node)
+                
+                if main_content is not None:
+                    html_text = main_content.text(separator='\n', strip=True)
+                elif receipt_content:
+                    # Fallback: tables or divs that might contain receipt data
+                    html_text = '\n'.join([node.text(separator='\n', strip=True) for node in receipt_content])
+                else:
+                    html_text = root.text(separator='\n', strip=True)
+            
+            elif "bppulse" in hint or "bp" in hint:
+                # BP Pulse specific handling
+                main_content = root
+                for node in root.traverse():
+                    if node.tag in ('div', 'td', 'table'):
+                        classes = node.attributes.get('class')
+                        if classes and _CONTENT_CLASS_RE.search(classes):
+                            main_content = node
+                            break
+                html_text = main_content.text(separator='\n', strip=True)
+            
+            else:
+                # General HTML processing
+                html_text = root.text(separator='\n', strip=True)
+            
+            # Clean the extracted text (which also drops the empty strings text() keeps)
+            return EmailUtils._clean_extracted_text(html_text, provider_hint)
+            
+        except Exception as e:
+            _LOGGER.error("Error extracting HTML content: %s", e)
+            return EmailUtils._simple_html_strip(html_content)
+    
     @staticmethod
     def _simple_html_strip(html_content: str) -> str:
         """Simple HTML stripping fallback."""
-        import re
-        
         # Remove scripts and styles
-        html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
+        html_content = _SCRIPT_RE.sub('', html_content)
+        html_content = _STYLE_RE.sub('', html_content)
         
-        # Replace common HTML entities
-        html_content = html_content.replace('&nbsp;', ' ')
-        html_content = html_content.replace('&amp;', '&')
-        html_content = html_content.replace('&lt;', '<')
-        html_content = html_content.replace('&gt;', '>')
-        html_content = html_content.replace('&quot;', '"')
+        # Decode HTML entities (named and numeric) in one pass
+        html_content = unescape(html_content)
         
         # Replace block-level tags with newlines
-        html_content = re.sub(r'<(?:div|p|br|tr|table|h[1-6])[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-        html_content = re.sub(r'</(?:div|p|tr|table|h[1-6])>', '\n', html_content, flags=re.IGNORECASE)
+        html_content = _BLOCK_OPEN_RE.sub('\n', html_content)
+        html_content = _BLOCK_CLOSE_RE.sub('\n', html_content)
         
         # Remove all remaining tags
-        html_content = re.sub(r'<[^>]+>', ' ', html_content)
+        html_content = _TAG_RE.sub(' ', html_content)
         
         # Clean whitespace
-        html_content = re.sub(r'\s+', ' ', html_content).strip()
+        html_content = _WS_RE.sub(' ', html_content).strip()
         
         return html_content
     
     @staticmethod
     def _clean_extracted_text(text: str, provider_hint: str = "") -> str:
         """Clean extracted text based on provider."""
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and common email artifacts
-            if not line or line in ['', ' ', '\t', '\n', '\r']:
-                continue
-            
-            # Skip common email footer/header content
-            skip_patterns = [
-                'unsubscribe',
-                'privacy policy',
-                'terms and conditions',
-                'view this email',
-                'download our app',
-                'follow us',
-                'social media',
-                'customer service',
-                'help center'
-            ]
-            
-            if any(pattern in line.lower() for pattern in skip_patterns):
-                continue
-            
-            # Skip URLs and email addresses (unless they're part of location data)
-            if (line.startswith('http') or 
-                line.startswith('www.') or 
-                line.startswith('mailto:') or
-                '@' in line and len(line.split()) == 1):
-                continue
-            
-            # For EVIE, be more permissive with content
-            if "evie" in provider_hint.lower():
-                if len(line) > 1:
-                    cleaned_lines.append(line)
-            else:
-                # Original filtering for other providers
-                if len(line) > 2:
-                    cleaned_lines.append(line)
+        # EVIE content is kept down to 2-character lines, other providers down to 3
+        line_re = _CLEAN_LINE_RE_EVIE if "evie" in provider_hint.lower() else _CLEAN_LINE_RE_OTHER
         
-        return '\n'.join(cleaned_lines)
+        # The regex strips each line and drops empty lines, URLs, bare email addresses and short
+        # lines; common email footer/header content is dropped from what remains
+        return '\n'.join([line for line in line_re.findall(text) if not _SKIP_RE.search(line.lower())])
+    
+    @staticmethod
+    def _decode_payload(part, payload: bytes) -> str:
+        """Decode a part's payload with its declared charset, falling back to UTF-8."""
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return payload.decode(charset, errors='replace')
+        except LookupError:
+            # Unknown charset name
+            return payload.decode('utf-8', errors='replace')
     
     @staticmethod
     def parse_email_content(raw_email: bytes, verbose_logging: bool = False) -> Dict[str, any]:
         """Parse email content with enhanced HTML processing and PDF extraction support."""
         try:
+            # Without a blank line between headers and body there is no content to extract, so
+            # junk or empty input never reaches the (comparatively slow) email parser
+            if b'\n\n' not in raw_email and b'\r\n\r\n' not in raw_email:
+                return {'subject': '', 'sender': '', 'text_content': '', 'has_pdf': False}
+            
             msg = email.message_from_bytes(raw_email)
             
             subject = msg.get('subject', '')
             sender = msg.get('from', '')
             
-            text_content = ""
-            pdf_content = ""
-            html_content = ""
+            # Parts are collected in lists and joined once after the walk
+            parts = _EmailParts()
             
-            # Determine provider for specialized processing
-            provider_hint = ""
-            sender_lower = sender.lower()
-            if "evie" in sender_lower or "goevie" in sender_lower:
-                provider_hint = "evie"
-            elif "bppulse" in sender_lower or "bp" in sender_lower:
-                provider_hint = "bppulse"
-            elif "chargefox" in sender_lower:
-                provider_hint = "chargefox"
-            elif "ampol" in sender_lower or "ampcharge" in sender_lower:
-                provider_hint = "ampol"
+            # Determine provider for specialized processing (senders repeat, so it is cached)
+            provider_hint = _provider_hint(sender)
             
             # Parse email parts
             if msg.is_multipart():
-                for part in msg.walk():
+                for part in _leaf_parts(msg):
                     content_type = part.get_content_type()
+                    handler = _PART_HANDLERS.get(content_type)
+                    if handler is None:
+                        continue
                     
-                    # Handle PDF attachments
-                    if content_type == "application/pdf":
-                        filename = part.get_filename()
-                        if filename:
-                            try:
-                                pdf_data = part.get_payload(decode=True)
-                                if pdf_data:
-                                    pdf_text = EmailUtils.extract_pdf_text(pdf_data)
-                                    if pdf_text:
-                                        pdf_content += f"\n=== PDF: {filename} ===\n{pdf_text}\n"
-                            except Exception as e:
-                                _LOGGER.warning("Error processing PDF attachment %s: %s", filename, e)
-                    
-                    # Handle text content
-                    elif content_type == "text/plain":
-                        try:
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                decoded_text = payload.decode('utf-8', errors='ignore')
-                                if decoded_text.strip():
-                                    text_content += decoded_text + "\n"
-                        except Exception as e:
-                            if verbose_logging:
-                                _LOGGER.debug("Error decoding text/plain: %s", e)
-                    
-                    # Handle HTML content
-                    elif content_type == "text/html":
-                        try:
-                            payload = part.get_payload(decode=True)
-                            if payload:
-                                html_text = payload.decode('utf-8', errors='ignore')
-                                if html_text.strip():
-                                    html_content += html_text + "\n"
-                        except Exception as e:
-                            if verbose_logging:
-                                _LOGGER.debug("Error decoding text/html: %s", e)
+                    try:
+                        handler(part, parts)
+                    except Exception as e:
+                        if content_type == "application/pdf":
+                            _LOGGER.warning("Error processing PDF attachment %s: %s", part.get_filename(), e)
+                        elif verbose_logging:
+                            _LOGGER.debug("Error decoding %s: %s", content_type, e)
             else:
                 # Handle non-multipart messages
                 payload = msg.get_payload(decode=True)
                 if payload:
                     try:
-                        decoded_text = payload.decode('utf-8', errors='ignore')
+                        decoded_text = EmailUtils._decode_payload(msg, payload)
                         if decoded_text.strip():
-                            text_content = decoded_text
+                            parts.text.append(decoded_text)
                     except Exception as e:
                         if verbose_logging:
                             _LOGGER.debug("Error decoding non-multipart content: %s", e)
             
+            text_content = "".join(parts.text)
+            pdf_content = "".join(parts.pdf)
+            html_content = "".join(parts.html)
+            
             # Enhanced HTML processing logic
             final_text_content = text_content
             
-            # If we have HTML content and either no plain text or very little plain text
-            if html_content.strip():
+            # Plain-text-only emails skip all of this (only non-blank HTML parts are collected).
+            # Otherwise the HTML is only parsed when the result can be used: for EVIE emails unless
+            # the HTML is too small to hold a receipt, else when there is no or very little plain text
+            if parts.html and (
+                (provider_hint == "evie" and len(html_content) >= 200) or len(text_content.strip()) < 100
+            ):
                 # Always extract from HTML for EVIE emails
                 if provider_hint == "evie":
                     extracted_html = EmailUtils.extract_html_content(html_content, provider_hint)
@@ -267,7 +463,7 @@ class EmailUtils:
                             _LOGGER.warning("HTML extraction for EVIE yielded insufficient content (%d chars)", len(extracted_html))
                 
                 # For other providers, fall back to HTML if plain text is insufficient
-                elif len(text_content.strip()) < 100:  # Very little or no plain text
+                else:
                     extracted_html = EmailUtils.extract_html_content(html_content, provider_hint)
                     minimum_threshold = 50 if provider_hint == "bppulse" else 100
                     
@@ -294,4 +490,92 @@ class EmailUtils:
             
         except Exception as e:
             _LOGGER.error("Error parsing email: %s", e)
-            return {'subject': '', 'sender': '', 'text_content': '', 'has_pdf': False}
\ No newline at end of file
+            return {'subject': '', 'sender': '', 'text_content': '', 'has_pdf': False}
+    
+    @staticmethod
+    def parse_many(raw_emails: Iterable[bytes], verbose_logging: bool = False,
+                   workers: Optional[int] = None, processes: bool = False) -> List[Dict[str, any]]:
+        """Parse a batch of raw emails in parallel, returning the results in input order.
+        
+        Threads are used by default, as Home Assistant integrations must not fork. processes=True
+        spreads a bulk mailbox import over all cores instead; emails are sent to the worker
+        processes in chunks so the per-email IPC does not outweigh the parsing.
+        """
+        raw_emails = list(raw_emails)
+        parse = functools.partial(EmailUtils.parse_email_content, verbose_logging=verbose_logging)
+        
+        if processes:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(parse, raw_emails, chunksize=32))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse, raw_emails))
+
+
+def _leaf_parts(msg):
+    """Yield the non-multipart parts of a message in the order Message.walk() visits them."""
+    stack = [msg]
+    while stack:
+        part = stack.pop()
+        if part.is_multipart():
+            stack.extend(reversed(part.get_payload()))
+        else:
+            yield part
+
+
+def _single_string(node) -> Optional[str]:
+    """Return a selectolax node's only string, as BeautifulSoup's Tag.string does."""
+    while True:
+        child = node.child
+        if child is None or child.next is not None:
+            return None
+        if child.is_text_node:
+            return child.text_content
+        if child.is_comment_node:
+            return child.comment_content
+        node = child
+
+
+@dataclass
+class _EmailParts:
+    """Text, HTML and PDF content collected while walking an email's parts."""
+    text: List[str] = field(default_factory=list)
+    html: List[str] = field(default_factory=list)
+    pdf: List[str] = field(default_factory=list)
+
+
+def _handle_pdf(part, parts: _EmailParts) -> None:
+    """Collect the text of a PDF attachment (PDF parts without a filename are ignored)."""
+    filename = part.get_filename()
+    if filename:
+        pdf_data = part.get_payload(decode=True)
+        if pdf_data:
+            pdf_text = EmailUtils.extract_pdf_text(pdf_data)
+            if pdf_text:
+                parts.pdf.append(f"\n=== PDF: {filename} ===\n{pdf_text}\n")
+
+
+def _handle_text(part, parts: _EmailParts) -> None:
+    """Collect a text/plain part."""
+    payload = part.get_payload(decode=True)
+    if payload:
+        decoded_text = EmailUtils._decode_payload(part, payload)
+        if decoded_text.strip():
+            parts.text.append(decoded_text + "\n")
+
+
+def _handle_html(part, parts: _EmailParts) -> None:
+    """Collect a text/html part."""
+    payload = part.get_payload(decode=True)
+    if payload:
+        html_text = EmailUtils._decode_payload(part, payload)
+        if html_text.strip():
+            parts.html.append(html_text + "\n")
+
+
+# parse_email_content's handlers for the leaf parts of a multipart email, by content type
+_PART_HANDLERS = {
+    "application/pdf": _handle_pdf,
+    "text/plain": _handle_text,
+    "text/html": _handle_html,
+}